@@ -16,11 +16,17 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from config import APIConfig, debug_info, debug_error
+from config import APIConfig, IS_DEBUG_MODE, debug_info, debug_error
 
 # Import routes
 from routes.chat_routes import router as chat_router
 from routes.general_ai_routes import router as general_ai_router
+from services.llm_service import get_llm_service, warm_llm_service
+from services.memory_service import get_memory_service
+
+
+# Fixed for the process lifetime; resolved once instead of per error
+_SHOW_ERROR_DETAIL: bool = IS_DEBUG_MODE
 
 
 @asynccontextmanager
@@ -36,9 +42,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """
     # Startup
     debug_info("🚀 NFL Chatbot API started successfully!")
-    debug_info(f"📚 Knowledge base path: {APIConfig.KNOWLEDGE_BASE_PATH}")
+    debug_info("📚 Knowledge base path: %s", APIConfig.KNOWLEDGE_BASE_PATH)
+    await warm_llm_service()
     yield
-    # Shutdown (nothing to clean up)
+    # Shutdown: release pooled HTTP connections
+    await get_llm_service().aclose()
+    await get_memory_service().aclose()
 
 
 # Initialize FastAPI app
@@ -55,6 +64,7 @@ app = FastAPI(
 app.add_middleware(
     CORSMiddleware,
     allow_origins=APIConfig.ALLOWED_ORIGINS,
+    allow_origin_regex=APIConfig.ALLOWED_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -92,13 +102,13 @@ async def global_exception_handler(request: Request, exc: Exception) -> JSONResp
     Returns:
         JSONResponse with error details
     """
-    debug_error(f"Unhandled error: {str(exc)}")
+    debug_error("Unhandled error: %s", exc)
     return JSONResponse(
         status_code=500,
         content={
             "status": "error",
             "message": "Internal server error",
-            "detail": str(exc) if APIConfig.IS_DEBUG_MODE else None
+            "detail": str(exc) if _SHOW_ERROR_DETAIL else None
         }
     )
 
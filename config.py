@@ -31,27 +31,54 @@ class APIConfig:
     
     # API Authentication
     API_KEY: ClassVar[str] = ConstantsVar.NFL_CHATBOT_API_KEY
+    API_KEY_BYTES: ClassVar[bytes] = API_KEY.encode()  # For constant-time compare
     
     # CORS Settings
-    ALLOWED_ORIGINS: ClassVar[list[str]] = [
+    # "*" already admits every origin, so list the real origins only when
+    # debug mode is off. Vercel deployments go through a regex because
+    # CORSMiddleware compares allow_origins entries literally.
+    ALLOWED_ORIGINS: ClassVar[list[str]] = ["*"] if IS_DEBUG_MODE else [
         "http://localhost:3000",
-        "http://localhost:8000",
-        "https://*.vercel.app",
-        "*"  # Allow all for development
+        "http://localhost:8000"
     ]
+    ALLOWED_ORIGIN_REGEX: ClassVar[str | None] = (
+        None if IS_DEBUG_MODE else r"https://.*\.vercel\.app"
+    )
     
     # Memory Settings
     MAX_MEMORY_LENGTH: ClassVar[int] = 10  # Max messages per user
     MEMORY_CLEANUP_THRESHOLD: ClassVar[int] = 100  # Cleanup when total users exceed
+    # Rolling summary of older history; needs the 'summary' role in chat_memory
+    ENABLE_MEMORY_SUMMARY: ClassVar[bool] = False
+    MEMORY_SUMMARY_THRESHOLD: ClassVar[float] = 0.8  # summarize above this share of MAX_MEMORY_LENGTH
+    MEMORY_KEEP_RECENT: ClassVar[int] = 5  # newest messages kept verbatim
     
     # LLM Settings
     DEFAULT_TEMPERATURE: ClassVar[float] = 0.85
     REQUEST_TIMEOUT: ClassVar[int] = 30  # seconds
+    CONNECT_TIMEOUT: ClassVar[float] = 5.0  # seconds, TCP + TLS setup only
+    LLM_HEDGE_DELAY: ClassVar[float] = 1.5  # seconds before also trying the next provider
+    PROVIDER_DEADLINE_S: ClassVar[float] = 8.0  # overall budget per provider attempt
+    LLM_RACE_WIDTH: ClassVar[int] = 1  # providers started at once; 2+ races them
+    MAX_PROMPT_CHARS: ClassVar[int] = 32_000  # longer prompts are rejected before any provider call
+    RESPONSE_CACHE_MAXSIZE: ClassVar[int] = 1024  # cached LLM responses
+    RESPONSE_CACHE_TTL: ClassVar[float] = 3600.0  # seconds
+    # RAG answer cache: repeats of a question in the same context skip the LLM.
+    # Off by default because the bot is meant to vary its phrasing.
+    ENABLE_PROMPT_CACHE: ClassVar[bool] = False
+    PROMPT_CACHE_MAXSIZE: ClassVar[int] = 1024
+    PROMPT_CACHE_TTL: ClassVar[float] = 300.0  # seconds
+    
+    # Outbound HTTP connection pool (shared client per service)
+    HTTP_MAX_CONNECTIONS: ClassVar[int] = 128
+    HTTP_MAX_KEEPALIVE: ClassVar[int] = 32
+    HTTP_KEEPALIVE_EXPIRY: ClassVar[float] = 30.0  # seconds
+    HTTP_CONNECT_RETRIES: ClassVar[int] = 2  # transport-level retries on connect failures only
     
     # Knowledge Base Path (in same folder as this config)
-    KNOWLEDGE_BASE_PATH: ClassVar[str] = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)),
-        "myData.md"
+    # Plain concatenation: the path is fully internal, no os.path.join needed
+    KNOWLEDGE_BASE_PATH: ClassVar[str] = (
+        os.path.dirname(os.path.abspath(__file__)) + os.sep + "myData.md"
     )
 
     # Supabase Settings
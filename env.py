@@ -4,13 +4,9 @@ Environment configuration module.
 This module centralizes all environment variables and API keys loading.
 """
 
-import sys
 import os
 import logging
 
-# Append project root to path to ensure utils can be imported if constant_var is run directly or from subdirs
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 from dotenv import load_dotenv
 
 IS_DEBUG_MODE: bool = True
@@ -21,7 +17,8 @@ load_dotenv(override=True)
 # Configure basic logging
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%H:%M:%S'  # Skip date + millisecond formatting on every record
 )
 app_logger: logging.Logger = logging.getLogger(__name__)
 
@@ -52,89 +49,118 @@ class ConstantsVar:
     SUPABASE_PROJECT_URL: str = os.getenv("SUPABASE_PROJECT_URL", "")
     SUPABASE_ANON_KEY: str = os.getenv("SUPABASE_ANON_PUBLIC_KEY", "")
 
-def debug_error(text: str) -> None:
+def _log_error(text: str, *args: object) -> None:
     """
     Log an error message using the file logger.
     
     Params:
         text (str): The error message to log.
+        *args (object): Lazy %-format arguments, applied only if emitted.
     
     Returns:
         None
     """
-    if IS_DEBUG_MODE:
-        app_logger.error(text)
+    if app_logger.isEnabledFor(logging.ERROR):
+        app_logger.error(text, *args)
 
 
-def debug_info(text: str) -> None:
+def _log_info(text: str, *args: object) -> None:
     """
     Log an informational message using the file logger.
     
     Params:
         text (str): The info message to log.
+        *args (object): Lazy %-format arguments, applied only if emitted.
     
     Returns:
         None
     """
-    if IS_DEBUG_MODE:
-        app_logger.info(text)
+    if app_logger.isEnabledFor(logging.INFO):
+        app_logger.info(text, *args)
 
 
-def debug_warning(text: str) -> None:
+def _log_warning(text: str, *args: object) -> None:
     """
     Log a warning message using the file logger.
     
     Params:
         text (str): The warning message to log.
+        *args (object): Lazy %-format arguments, applied only if emitted.
     
     Returns:
         None
     """
-    if IS_DEBUG_MODE:
-        app_logger.warning(text)
+    if app_logger.isEnabledFor(logging.WARNING):
+        app_logger.warning(text, *args)
 
 
-def debug_success(text: str) -> None:
+def _log_success(text: str, *args: object) -> None:
     """
     Log a success message (as info) using the file logger.
     
     Params:
         text (str): The success message to log.
+        *args (object): Lazy %-format arguments, applied only if emitted.
     
     Returns:
         None
     """
-    if IS_DEBUG_MODE:
-        # Logging doesn't have a 'success' level, map to INFO with a prefix
-        app_logger.info(f"[SUCCESS] {text}")
+    # Logging doesn't have a 'success' level, map to INFO with a prefix
+    if app_logger.isEnabledFor(logging.INFO):
+        app_logger.info("[SUCCESS] " + text, *args)
 
 
-def debug_critical(text: str) -> None:
+def _log_critical(text: str, *args: object) -> None:
     """
     Log a critical message using the file logger.
     
     Params:
         text (str): The critical message to log.
+        *args (object): Lazy %-format arguments, applied only if emitted.
     
     Returns:
         None
     """
-    if IS_DEBUG_MODE:
-        app_logger.critical(text)
+    if app_logger.isEnabledFor(logging.CRITICAL):
+        app_logger.critical(text, *args)
 
 
-def debug_prompt(text: str) -> None:
+def _log_prompt(text: str, *args: object) -> None:
     """
     Log a prompt message using the dedicated prompt logger.
     
     Params:
         text (str): The prompt message to log.
+        *args (object): Lazy %-format arguments, applied only if emitted.
+    
+    Returns:
+        None
+    """
+    if app_logger.isEnabledFor(logging.INFO):
+        app_logger.info("[PROMPT] " + text, *args)
+
+
+def _noop(text: str, *args: object) -> None:
+    """
+    Discard a log message (stand-in for disabled debug_* helpers).
+    
+    Params:
+        text (str): The ignored message.
+        *args (object): The ignored format arguments.
     
     Returns:
         None
     """
-    if IS_PROMPT_CHECK:
-        app_logger.info(f"[PROMPT] {text}")
+
+
+# The flags are fixed at import, so resolve them once here instead of
+# checking them inside every debug_* call
+debug_error = _log_error if IS_DEBUG_MODE else _noop
+debug_info = _log_info if IS_DEBUG_MODE else _noop
+debug_warning = _log_warning if IS_DEBUG_MODE else _noop
+debug_success = _log_success if IS_DEBUG_MODE else _noop
+debug_critical = _log_critical if IS_DEBUG_MODE else _noop
+debug_prompt = _log_prompt if IS_PROMPT_CHECK else _noop
 
 
 if __name__ == "__main__":
@@ -8,7 +8,17 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# Shared config for models built on every request: immutable after
+# validation, unknown keys dropped, no re-validation on assignment
+_HOT_PATH_CONFIG: ConfigDict = ConfigDict(
+    frozen=True,
+    extra="ignore",
+    validate_assignment=False,
+    str_strip_whitespace=False
+)
 
 
 class ChatStatus(str, Enum):
@@ -27,6 +37,8 @@ class ChatRequest(BaseModel):
         message: The user's message/question
         include_memory: Whether to include conversation history
     """
+    model_config = _HOT_PATH_CONFIG
+    
     user_id: str = Field(..., description="Unique user identifier", min_length=1)
     message: str = Field(..., description="User message", min_length=1, max_length=2000)
     include_memory: bool = Field(default=True, description="Include conversation history")
@@ -44,6 +56,8 @@ class ChatResponse(BaseModel):
         memory_length: Current conversation memory length
         error_message: Error details if status is error
     """
+    model_config = _HOT_PATH_CONFIG
+    
     status: ChatStatus
     response: Optional[str] = None
     provider: Optional[str] = None
@@ -57,11 +71,11 @@ class MemoryItem(BaseModel):
     Single conversation memory item.
     
     Attributes:
-        role: Either 'user' or 'assistant'
+        role: 'user', 'assistant', or 'summary' (condensed older history)
         content: The message content
         timestamp: When the message was created
     """
-    role: str = Field(..., pattern="^(user|assistant)$")
+    role: str = Field(..., pattern="^(user|assistant|summary)$")
     content: str
     timestamp: datetime = Field(default_factory=datetime.now)
 
@@ -104,6 +118,8 @@ class GeneralAIRequest(BaseModel):
         system_prompt: Optional custom system prompt for AI personality
         temperature: Optional temperature override (0.0-1.0)
     """
+    model_config = _HOT_PATH_CONFIG
+    
     user_id: str = Field(..., description="Unique user identifier", min_length=1)
     message: str = Field(..., description="User message", min_length=1, max_length=2000)
     system_prompt: Optional[str] = Field(None, description="Custom system prompt", max_length=500)
@@ -122,6 +138,8 @@ class GeneralAIResponse(BaseModel):
         memory_length: Current conversation memory length
         error_message: Error details if status is error
     """
+    model_config = _HOT_PATH_CONFIG
+    
     status: str
     response: str = ""
     provider: Optional[str] = None
@@ -0,0 +1,53 @@
+"""
+Auth helpers shared by all routers.
+
+This module provides API key verification for protected endpoints.
+"""
+
+import hmac
+import sys
+
+from fastapi import Header, HTTPException, status
+
+from config import APIConfig, debug_warning
+
+
+# Bound once at import so each check reuses the configured objects
+_API_KEY: str = sys.intern(APIConfig.API_KEY)
+_API_KEY_BYTES: bytes = APIConfig.API_KEY_BYTES
+
+
+def verify_api_key(x_api_key: str | None = Header(None)) -> str:
+    """
+    Verify API key from header.
+
+    Uses a constant-time comparison so response timing does not leak
+    how much of the key matched.
+
+    Args:
+        x_api_key: API key from X-API-Key header
+
+    Returns:
+        The validated API key
+
+    Raises:
+        HTTPException: If API key is missing or invalid
+    """
+    # Check if header is completely missing (None), not just empty string
+    if x_api_key is None:
+        debug_warning("[Auth] Missing API key")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing API key. Provide X-API-Key header."
+        )
+
+    # Allow empty string if configured in APIConfig.
+    # Identity check first: an interned match skips encoding and comparing.
+    if x_api_key is not _API_KEY and not hmac.compare_digest(x_api_key.encode(), _API_KEY_BYTES):
+        debug_warning("[Auth] Invalid API key: %.8s...", x_api_key or "(empty)")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid API key"
+        )
+
+    return x_api_key
@@ -4,56 +4,27 @@ Chat Routes - API endpoints for chatbot.
 This module provides FastAPI routes for chat, health check, and memory management.
 """
 
-from typing import Any, Optional
+from fastapi import APIRouter, BackgroundTasks, Header
 
-from fastapi import APIRouter, Header, HTTPException, status
-
-from config import APIConfig, debug_info, debug_error, debug_warning
+from config import debug_info, debug_error
 from models.schemas import (
     ChatRequest,
     ChatResponse,
-    ChatStatus,
     HealthResponse,
     ClearMemoryResponse
 )
 from services.rag_service import get_rag_service
 from services.llm_service import get_llm_service, LLMStatus
 from services.memory_service import get_memory_service
+from routes._auth import verify_api_key
 
 
 router = APIRouter(tags=["Chat"])
 
-
-def verify_api_key(x_api_key: Optional[str] = Header(None)) -> str:
-    """
-    Verify API key from header.
-    
-    Args:
-        x_api_key: API key from X-API-Key header
-        
-    Returns:
-        The validated API key
-        
-    Raises:
-        HTTPException: If API key is missing or invalid
-    """
-    # Check if header is completely missing (None), not just empty string
-    if x_api_key is None:
-        debug_warning("[Auth] Missing API key")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing API key. Provide X-API-Key header."
-        )
-    
-    # Allow empty string if configured in APIConfig
-    if x_api_key != APIConfig.API_KEY:
-        debug_warning(f"[Auth] Invalid API key: {x_api_key[:8] if x_api_key else '(empty)'}...")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Invalid API key"
-        )
-    
-    return x_api_key
+# Service singletons bound once so handlers skip the getter on every request
+_rag_service = get_rag_service()
+_llm_service = get_llm_service()
+_memory_service = get_memory_service()
 
 
 @router.get("/health", response_model=HealthResponse)
@@ -64,8 +35,7 @@ async def health_check() -> HealthResponse:
     Returns:
         HealthResponse with API status
     """
-    llm_service = get_llm_service()
-    providers: list[str] = llm_service.get_available_providers()
+    providers: tuple[str, ...] = _llm_service.get_available_providers()
     
     return HealthResponse(
         status="healthy",
@@ -77,6 +47,7 @@ async def health_check() -> HealthResponse:
 @router.post("/chat", response_model=ChatResponse)
 async def chat(
     request: ChatRequest,
+    background_tasks: BackgroundTasks,
     x_api_key: str = Header(..., description="API Key for authentication")
 ) -> ChatResponse:
     """
@@ -84,6 +55,7 @@ async def chat(
     
     Args:
         request: Chat request with user_id and message
+        background_tasks: Runs after the response is sent
         x_api_key: API key header
         
     Returns:
@@ -92,35 +64,34 @@ async def chat(
     # Verify API key
     verify_api_key(x_api_key)
     
-    debug_info(f"[API] Chat request from user: {request.user_id[:8]}...")
-    debug_info(f"[API] Message: {request.message[:50]}...")
+    debug_info("[API] Chat request from user: %.8s... | Message: %.50s...", request.user_id, request.message)
+    
+    # Memory writes run in the background; finish them before the request ends
+    background_tasks.add_task(_memory_service.flush, request.user_id, summaries=True)
     
     try:
-        # Get RAG service and process query
-        rag_service = get_rag_service()
-        memory_service = get_memory_service()
-        
-        response = await rag_service.process_query(
+        # Process query through the RAG pipeline
+        response = await _rag_service.process_query(
             user_id=request.user_id,
             message=request.message,
             include_memory=request.include_memory
         )
         
         # Get current memory length
-        memory_length: int = await memory_service.get_memory_length(request.user_id)
+        memory_length: int = await _memory_service.get_memory_length(request.user_id)
         
         if response.status == LLMStatus.SUCCESS:
             return ChatResponse(
-                status=ChatStatus.SUCCESS,
+                status="success",
                 response=response.content,
                 provider=response.provider,
                 model=response.model,
                 memory_length=memory_length
             )
         else:
-            debug_error(f"[API] LLM error: {response.error_message}")
+            debug_error("[API] LLM error: %s", response.error_message)
             return ChatResponse(
-                status=ChatStatus.ERROR,
+                status="error",
                 response="Wah maaf, ada error nih. Coba lagi nanti ya!",
                 provider=response.provider,
                 model=response.model,
@@ -129,9 +100,9 @@ async def chat(
             )
             
     except Exception as e:
-        debug_error(f"[API] Unexpected error: {e}")
+        debug_error("[API] Unexpected error: %s", e)
         return ChatResponse(
-            status=ChatStatus.ERROR,
+            status="error",
             error_message=str(e)
         )
 
@@ -154,10 +125,9 @@ async def clear_memory(
     # Verify API key
     verify_api_key(x_api_key)
     
-    debug_info(f"[API] Clearing memory for user: {user_id[:8]}...")
+    debug_info("[API] Clearing memory for user: %.8s...", user_id)
     
-    memory_service = get_memory_service()
-    messages_cleared: int = await memory_service.clear_memory(user_id)
+    messages_cleared: int = await _memory_service.clear_memory(user_id)
     
     return ClearMemoryResponse(
         status="success",
@@ -170,7 +140,7 @@ async def clear_memory(
 async def get_memory_length(
     user_id: str,
     x_api_key: str = Header(..., description="API Key for authentication")
-) -> dict[str, Any]:
+) -> dict[str, int | str]:
     """
     Get memory length for a user.
     
@@ -184,8 +154,7 @@ async def get_memory_length(
     # Verify API key
     verify_api_key(x_api_key)
     
-    memory_service = get_memory_service()
-    length: int = await memory_service.get_memory_length(user_id)
+    length: int = await _memory_service.get_memory_length(user_id)
     
     return {
         "user_id": user_id,
@@ -5,52 +5,71 @@ This module provides endpoints for general conversation using LLM + memory only.
 No knowledge base injection, just pure conversational AI.
 """
 
-from typing import Optional
-from fastapi import APIRouter, Header, HTTPException, status
+import asyncio
+from collections.abc import AsyncIterator
+from functools import cache
 
-from config import APIConfig, debug_info, debug_error, debug_warning
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Header
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from config import APIConfig, debug_info, debug_error
 from models.schemas import (
     GeneralAIRequest,
     GeneralAIResponse,
     ClearMemoryResponse
 )
-from services.llm_service import get_llm_service, LLMStatus
+from services.llm_service import get_llm_service, LLMStatus, LLMStreamError
 from services.memory_service import get_memory_service
+from routes._auth import verify_api_key
 
 
 router = APIRouter(tags=["General AI"])
 
+# Config values are fixed for the process lifetime; resolve them once at import
+_DEFAULT_TEMPERATURE: float = APIConfig.DEFAULT_TEMPERATURE
+_MAX_PROMPT_CHARS: int = APIConfig.MAX_PROMPT_CHARS
+
+# Service singletons bound once so handlers skip the getter on every request
+_llm_service = get_llm_service()
+_memory_service = get_memory_service()
+
+# Default system prompt, pre-rendered as the prompt header line
+_DEFAULT_SYSTEM_PROMPT: str = "You are a helpful, friendly AI assistant. Answer questions clearly and concisely."
+_DEFAULT_SYSTEM_HEADER: str = f"System: {_DEFAULT_SYSTEM_PROMPT}\n"
 
-def verify_api_key(x_api_key: Optional[str] = Header(None)) -> str:
+# Speaker labels for history turns; any other role renders as Assistant
+_ROLE_LABELS: dict[str, str] = {"user": "User", "summary": "Summary of earlier conversation"}
+
+
+@cache
+def _prompt_template(n_history: int) -> str:
     """
-    Verify API key from header.
+    Get the str.format template for a prompt with n history turns.
+    
+    Only the shape depends on n, so each template is built once and reused.
+    Positional fields: {0} header, {1} current message, then a
+    (role, content) pair per history turn.
     
     Args:
-        x_api_key: API key from X-API-Key header
+        n_history: Number of history turns in the prompt
         
     Returns:
-        The validated API key
-        
-    Raises:
-        HTTPException: If API key is missing or invalid
+        str: Format template for that prompt shape
     """
-    # Check if header is completely missing (None), not just empty string
-    if x_api_key is None:
-        debug_warning("[Auth] Missing API key")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing API key. Provide X-API-Key header."
-        )
+    if n_history == 0:
+        return "{0}\nUser: {1}\nAssistant:"
     
-    # Allow empty string if configured in APIConfig
-    if x_api_key != APIConfig.API_KEY:
-        debug_warning(f"[Auth] Invalid API key: {x_api_key[:8] if x_api_key else '(empty)'}...")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Invalid API key"
-        )
-    
-    return x_api_key
+    turns: str = "\n".join(f"{{{2 * i + 2}}}: {{{2 * i + 3}}}" for i in range(n_history))
+    return (
+        "{0}\n"
+        "\n=== Conversation History ===\n"
+        f"{turns}\n"
+        "\n=== Current Conversation ===\n"
+        "User: {1}\n"
+        "Assistant:"
+    )
 
 
 async def build_conversation_prompt(
@@ -62,6 +81,10 @@ async def build_conversation_prompt(
     """
     Build a simple conversational prompt with memory.
     
+    The oldest history turns are dropped until the prompt fits within
+    APIConfig.MAX_PROMPT_CHARS. A message too long on its own is left for
+    the LLM service to reject.
+    
     Args:
         user_message: Current user message
         user_id: User identifier for memory lookup
@@ -71,38 +94,36 @@ async def build_conversation_prompt(
     Returns:
         str: Complete prompt with system + history + current message
     """
-    memory_service = get_memory_service()
-    
-    # Default system prompt
-    default_system: str = "You are a helpful, friendly AI assistant. Answer questions clearly and concisely."
-    system: str = system_prompt or default_system
+    # Get conversation history, warming the LLM client meanwhile
+    memory_items, _ = await asyncio.gather(
+        _memory_service.get_memory(user_id),
+        _llm_service.warmup()
+    )
     
-    # Get conversation history
-    memory_items = await memory_service.get_memory(user_id)
+    # Default header is prebuilt; only custom prompts need formatting
+    header: str = f"System: {system_prompt}\n" if system_prompt else _DEFAULT_SYSTEM_HEADER
     
-    # Build prompt
-    prompt_parts: list[str] = [f"System: {system}\n"]
+    # Get last N messages (slice already returns the whole list when shorter)
+    recent_history = memory_items[-max_history:]
+    turn_fields: list[str] = []
+    for item in recent_history:
+        turn_fields.append(_ROLE_LABELS.get(item["role"], "Assistant"))
+        turn_fields.append(item["content"])
     
-    if memory_items:
-        prompt_parts.append("\n=== Conversation History ===")
-        # Get last N messages
-        recent_history = memory_items[-max_history:] if len(memory_items) > max_history else memory_items
-        
-        for item in recent_history:
-            role: str = "User" if item["role"] == "user" else "Assistant"
-            prompt_parts.append(f"{role}: {item['content']}")
-        
-        prompt_parts.append("\n=== Current Conversation ===")
+    prompt: str = _prompt_template(len(recent_history)).format(header, user_message, *turn_fields)
     
-    prompt_parts.append(f"User: {user_message}")
-    prompt_parts.append("Assistant:")
+    # Over the limit: drop the oldest history turns until it fits
+    while len(prompt) > _MAX_PROMPT_CHARS and turn_fields:
+        del turn_fields[:2]
+        prompt = _prompt_template(len(turn_fields) // 2).format(header, user_message, *turn_fields)
     
-    return "\n".join(prompt_parts)
+    return prompt
 
 
 @router.post("/general-ai", response_model=GeneralAIResponse)
 async def general_ai_chat(
     request: GeneralAIRequest,
+    background_tasks: BackgroundTasks,
     x_api_key: str = Header(..., description="API Key for authentication")
 ) -> GeneralAIResponse:
     """
@@ -113,6 +134,7 @@ async def general_ai_chat(
     
     Args:
         request: Chat request with user_id and message
+        background_tasks: Runs after the response is sent
         x_api_key: API key header
         
     Returns:
@@ -121,17 +143,13 @@ async def general_ai_chat(
     # Verify API key
     verify_api_key(x_api_key)
     
-    debug_info(f"[General AI] Request from user: {request.user_id}")
-    debug_info(f"[General AI] Message: {request.message[:50]}...")
+    debug_info("[General AI] Request from user: %s | Message: %.50s...", request.user_id, request.message)
     
-    memory_service = get_memory_service()
-    llm_service = get_llm_service()
+    # Memory writes run in the background; finish them before the request ends
+    background_tasks.add_task(_memory_service.flush, request.user_id, summaries=True)
     
     try:
-        # Save user message to memory
-        await memory_service.add_message(request.user_id, "user", request.message)
-        
-        # Build conversation prompt
+        # Build conversation prompt from the history before this turn
         prompt: str = await build_conversation_prompt(
             user_message=request.message,
             user_id=request.user_id,
@@ -139,16 +157,19 @@ async def general_ai_chat(
             max_history=10
         )
         
+        # Save user message to memory in the background
+        _memory_service.add_message_nowait(request.user_id, "user", request.message)
+        
         # Query LLM with optional temperature override
-        temperature: float = request.temperature if request.temperature is not None else APIConfig.DEFAULT_TEMPERATURE
-        response = await llm_service.query(prompt, temperature=temperature)
+        temperature: float = request.temperature if request.temperature is not None else _DEFAULT_TEMPERATURE
+        response = await _llm_service.query(prompt, temperature=temperature)
         
         # Get current memory length
-        memory_length: int = await memory_service.get_memory_length(request.user_id)
+        memory_length: int = await _memory_service.get_memory_length(request.user_id)
         
         if response.status == LLMStatus.SUCCESS:
-            # Save assistant response to memory
-            await memory_service.add_message(request.user_id, "assistant", response.content)
+            # Save assistant response to memory (lands after the user message)
+            _memory_service.add_message_nowait(request.user_id, "assistant", response.content)
             
             return GeneralAIResponse(
                 status="success",
@@ -158,7 +179,7 @@ async def general_ai_chat(
                 memory_length=memory_length
             )
         else:
-            debug_error(f"[General AI] LLM error: {response.error_message}")
+            debug_error("[General AI] LLM error: %s", response.error_message)
             return GeneralAIResponse(
                 status="error",
                 response="Sorry, I encountered an error. Please try again.",
@@ -169,7 +190,7 @@ async def general_ai_chat(
             )
             
     except Exception as e:
-        debug_error(f"[General AI] Unexpected error: {e}")
+        debug_error("[General AI] Unexpected error: %s", e)
         return GeneralAIResponse(
             status="error",
             response="An unexpected error occurred.",
@@ -177,6 +198,75 @@ async def general_ai_chat(
         )
 
 
+@router.post("/general-ai/stream")
+async def general_ai_chat_stream(
+    request: GeneralAIRequest,
+    x_api_key: str = Header(..., description="API Key for authentication")
+) -> StreamingResponse:
+    """
+    Streaming variant of the general AI chat endpoint.
+    
+    Sends the reply as Server-Sent Events while the provider generates it:
+    a `data: {"content": "..."}` event per chunk, then `event: done`, or
+    `event: error` when no provider produced any text or the reply broke
+    off midway. A broken reply is not saved to memory.
+    
+    Args:
+        request: Chat request with user_id and message
+        x_api_key: API key header
+        
+    Returns:
+        StreamingResponse with a text/event-stream body
+    """
+    # Verify API key
+    verify_api_key(x_api_key)
+    
+    debug_info("[General AI] Stream request from user: %s | Message: %.50s...", request.user_id, request.message)
+    
+    # Build the prompt before the response starts so memory errors surface as HTTP errors
+    prompt: str = await build_conversation_prompt(
+        user_message=request.message,
+        user_id=request.user_id,
+        system_prompt=request.system_prompt,
+        max_history=10
+    )
+    
+    # Save user message to memory in the background
+    _memory_service.add_message_nowait(request.user_id, "user", request.message)
+    
+    temperature: float = request.temperature if request.temperature is not None else _DEFAULT_TEMPERATURE
+    
+    async def event_stream() -> AsyncIterator[bytes]:
+        chunks: list[str] = []
+        try:
+            async for chunk in _llm_service.query_stream(prompt, temperature=temperature):
+                chunks.append(chunk)
+                yield b"data: " + orjson.dumps({"content": chunk}) + b"\n\n"
+        except LLMStreamError as e:
+            # The client already has part of the reply; flag it as broken and
+            # keep the truncated text out of memory
+            debug_error("[General AI] %s", e)
+            yield b"event: error\ndata: " + orjson.dumps({"error_message": "Response interrupted"}) + b"\n\n"
+            return
+        
+        if not chunks:
+            debug_error("[General AI] Stream produced no output")
+            yield b"event: error\ndata: " + orjson.dumps({"error_message": "All LLM providers failed"}) + b"\n\n"
+            return
+        
+        # Save assistant response to memory (lands after the user message)
+        _memory_service.add_message_nowait(request.user_id, "assistant", "".join(chunks))
+        yield b"event: done\ndata: {}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+        # Runs once the stream ends, after the assistant reply is queued
+        background=BackgroundTask(_memory_service.flush, request.user_id, summaries=True)
+    )
+
+
 @router.delete("/general-ai/memory/{user_id}", response_model=ClearMemoryResponse)
 async def clear_general_ai_memory(
     user_id: str,
@@ -195,10 +285,9 @@ async def clear_general_ai_memory(
     # Verify API key
     verify_api_key(x_api_key)
     
-    debug_info(f"[General AI] Clearing memory for user: {user_id[:8]}...")
+    debug_info("[General AI] Clearing memory for user: %.8s...", user_id)
     
-    memory_service = get_memory_service()
-    messages_cleared: int = await memory_service.clear_memory(user_id)
+    messages_cleared: int = await _memory_service.clear_memory(user_id)
     
     return ClearMemoryResponse(
         status="success",
@@ -211,7 +300,7 @@ async def clear_general_ai_memory(
 async def get_general_ai_memory_length(
     user_id: str,
     x_api_key: str = Header(..., description="API Key for authentication")
-) -> dict:
+) -> dict[str, int | str]:
     """
     Get the number of messages in conversation history.
     
@@ -225,8 +314,7 @@ async def get_general_ai_memory_length(
     # Verify API key
     verify_api_key(x_api_key)
     
-    memory_service = get_memory_service()
-    length: int = await memory_service.get_memory_length(user_id)
+    length: int = await _memory_service.get_memory_length(user_id)
     
     return {
         "user_id": user_id,
@@ -2,7 +2,7 @@
 Services package initialization.
 """
 
-from services.llm_service import LLMService, LLMResponse, LLMStatus, get_llm_service
+from services.llm_service import LLMService, LLMResponse, LLMStatus, LLMStreamError, get_llm_service
 from services.rag_service import RAGService, get_rag_service
 from services.memory_service import MemoryService, get_memory_service
 
@@ -10,6 +10,7 @@ __all__ = [
     "LLMService",
     "LLMResponse", 
     "LLMStatus",
+    "LLMStreamError",
     "get_llm_service",
     "RAGService",
     "get_rag_service",
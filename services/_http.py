@@ -0,0 +1,36 @@
+"""
+HTTP client factory shared by the services.
+
+This module builds the pooled httpx client used for provider and
+Supabase calls, so both services get the same transport settings.
+"""
+
+import httpx
+
+from config import APIConfig
+
+
+def make_client(timeout: float | httpx.Timeout) -> httpx.AsyncClient:
+    """
+    Create a pooled HTTP/2 client with the configured retries and limits.
+    
+    Args:
+        timeout: Request timeout, in seconds or as an httpx.Timeout
+        
+    Returns:
+        httpx.AsyncClient: A new pooled client; the caller owns closing it.
+    """
+    return httpx.AsyncClient(
+        # Pool settings live on the transport: a client given an
+        # explicit transport ignores its own http2/limits arguments
+        transport=httpx.AsyncHTTPTransport(
+            http2=True,  # One multiplexed connection per host (needs httpx[http2])
+            retries=APIConfig.HTTP_CONNECT_RETRIES,
+            limits=httpx.Limits(
+                max_keepalive_connections=APIConfig.HTTP_MAX_KEEPALIVE,
+                max_connections=APIConfig.HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=APIConfig.HTTP_KEEPALIVE_EXPIRY
+            )
+        ),
+        timeout=timeout
+    )
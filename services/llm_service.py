@@ -7,11 +7,19 @@ when one provider fails. Uses native httpx for lightweight Vercel deployment.
 Providers: Ai4Chat (primary) -> Cerebras -> Groq -> OpenRouter -> Gemini.
 """
 
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
 from dataclasses import dataclass
-from enum import Enum
-from typing import Any, Optional
+from enum import IntEnum
+from functools import lru_cache
+from typing import Any, ClassVar, Optional
 
 import httpx
+import orjson
 
 from config import (
     ConstantsVar,
@@ -21,9 +29,153 @@ from config import (
     debug_warning,
     debug_success
 )
+from services._http import make_client
+from services.response_cache import ResponseCache
 
 
-class LLMStatus(Enum):
+# Ai4Chat endpoint and its fixed request headers
+_AI4CHAT_URL: str = "https://yw85opafq6.execute-api.us-east-1.amazonaws.com/default/boss_mode_15aug"
+_AI4CHAT_HEADERS: dict[str, str] = {
+    "User-Agent": "Mozilla/5.0 (Linux; Android 11) Chrome/90.0.0.0",
+    "Referer": "https://www.ai4chat.co/pages/riddle-generator"
+}
+
+def _ai4chat_params(prompt: str, system: Optional[str] = None) -> dict[str, str]:
+    """
+    Build the Ai4Chat query string parameters.
+    
+    Ai4Chat takes a single text field, so a system prefix is prepended.
+    
+    Args:
+        prompt (str): The per-request prompt.
+        system (Optional[str]): Static system prefix, if any.
+        
+    Returns:
+        dict[str, str]: Query parameters for the Ai4Chat GET request.
+    """
+    return {
+        "text": f"{system}\n\n{prompt}" if system else prompt,
+        "country": "Indonesia",
+        "user_id": "FalBot_Naufal"
+    }
+
+
+def _openai_payload(
+    provider: "LLMProvider",
+    prompt: str,
+    temperature: float,
+    system: Optional[str] = None
+) -> dict[str, Any]:
+    """
+    Build an OpenAI-compatible /chat/completions request body.
+    
+    The system text goes first as its own message so the provider sees a
+    byte-identical prefix on every request and can reuse its prompt cache.
+    OpenRouter only caches blocks that carry an explicit cache_control
+    marker; the other providers cache prefixes automatically and would
+    reject the extra field.
+    
+    Args:
+        provider (LLMProvider): The provider configuration.
+        prompt (str): The per-request prompt.
+        temperature (float): Sampling temperature.
+        system (Optional[str]): Static system prefix, if any.
+        
+    Returns:
+        dict[str, Any]: JSON-serializable request body.
+    """
+    messages: list[dict[str, Any]] = []
+    if system:
+        if provider.name == "OpenRouter":
+            messages.append({
+                "role": "system",
+                "content": [
+                    {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}
+                ]
+            })
+        else:
+            messages.append({"role": "system", "content": system})
+    messages.append({"role": "user", "content": prompt})
+    
+    return {
+        "model": provider.model,
+        "messages": messages,
+        "temperature": temperature
+    }
+
+
+def _gemini_payload(prompt: str, temperature: float, system: Optional[str] = None) -> dict[str, Any]:
+    """
+    Build a Gemini generateContent request body.
+    
+    Args:
+        prompt (str): The per-request prompt.
+        temperature (float): Sampling temperature.
+        system (Optional[str]): Static system prefix, sent as systemInstruction.
+        
+    Returns:
+        dict[str, Any]: JSON-serializable request body.
+    """
+    payload: dict[str, Any] = {
+        "contents": [
+            {
+                "parts": [
+                    {"text": prompt}
+                ]
+            }
+        ],
+        "generationConfig": {
+            "temperature": temperature
+        }
+    }
+    if system:
+        payload["systemInstruction"] = {"parts": [{"text": system}]}
+    return payload
+
+
+# Instructions for folding older chat history into a memory summary
+_SUMMARY_INSTRUCTIONS: str = (
+    "Summarize the conversation below in a few short sentences. Keep names, "
+    "facts, preferences and open questions the user mentioned; drop small talk. "
+    "Write the summary in the same language as the conversation."
+)
+_SUMMARY_ROLE_LABELS: dict[str, str] = {"user": "User", "summary": "Earlier summary"}
+
+
+# Prompt length cap, fixed for the process lifetime
+_MAX_PROMPT_CHARS: int = APIConfig.MAX_PROMPT_CHARS
+
+
+def _reject_prompt(prompt: str, system: Optional[str] = None) -> Optional[str]:
+    """
+    Check a prompt before it costs any provider round-trip.
+    
+    The system prefix is sent along with the prompt, so it counts toward
+    the length limit too.
+    
+    Args:
+        prompt (str): The prompt to validate.
+        system (Optional[str]): System prefix sent with the prompt.
+        
+    Returns:
+        Optional[str]: Reason the prompt is rejected, or None if it is usable.
+    """
+    if not prompt or prompt.isspace():
+        return "Empty prompt"
+    length: int = len(prompt) + len(system or "")
+    if length > _MAX_PROMPT_CHARS:
+        return f"Prompt too long: {length} > {_MAX_PROMPT_CHARS} characters"
+    return None
+
+
+# Provider API keys, fixed for the process lifetime
+_CEREBRAS_API_KEY: str = ConstantsVar.MY_CEREBRAS_API_KEY
+_GROQ_API_KEY: str = ConstantsVar.MY_GROQ_API_KEY
+_OPENROUTER_API_KEY: str = ConstantsVar.MY_OPENROUTER_API_KEY
+_GEMINI_API_KEY: str = ConstantsVar.MY_GEMINI_API_KEY
+
+
+class LLMStatus(IntEnum):
     """Enum for LLM response status."""
     SUCCESS = 200
     ERROR = 500
@@ -32,7 +184,7 @@ class LLMStatus(Enum):
     MODEL_NOT_FOUND = 404
 
 
-@dataclass
+@dataclass(frozen=True, slots=True, kw_only=True)
 class LLMResponse:
     """Response object from LLM query."""
     status: LLMStatus
@@ -42,7 +194,11 @@ class LLMResponse:
     error_message: Optional[str] = None
 
 
-@dataclass
+class LLMStreamError(Exception):
+    """Raised when a stream fails after part of the reply was already sent."""
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
 class LLMProvider:
     """Configuration for an LLM provider."""
     name: str
@@ -51,6 +207,203 @@ class LLMProvider:
     model: str
     priority: int
     provider_type: str  # "openai_compatible", "google", or "ai4chat"
+    rpm: Optional[int] = None  # Requests per minute allowed, None if unlimited
+
+
+class _Breaker:
+    """
+    Per-provider circuit breaker.
+    
+    A tripped breaker stays open for an exponential cool-down with jitter.
+    Once that expires it goes half-open and lets requests through again:
+    success closes it, another trip reopens it with a longer cool-down.
+    """
+    
+    CLOSED: ClassVar[str] = "closed"
+    OPEN: ClassVar[str] = "open"
+    HALF_OPEN: ClassVar[str] = "half-open"
+    MAX_COOLDOWN: ClassVar[float] = 300.0  # seconds
+    
+    __slots__ = ("name", "failures", "last_failure_ts", "open_until", "state")
+    
+    def __init__(self, name: str) -> None:
+        """
+        Initialize a closed breaker.
+        
+        Args:
+            name (str): Provider name, used in log messages.
+        """
+        self.name: str = name
+        self.failures: int = 0
+        self.last_failure_ts: float = 0.0
+        self.open_until: float = 0.0
+        self.state: str = self.CLOSED
+    
+    def is_open(self) -> bool:
+        """
+        Check whether the provider should be skipped right now.
+        
+        Returns:
+            bool: True while the cool-down is running.
+        """
+        if self.state != self.OPEN:
+            return False
+        
+        if time.monotonic() < self.open_until:
+            return True
+        
+        self.state = self.HALF_OPEN
+        debug_info("[LLM] Circuit half-open for %s, probing", self.name)
+        return False
+    
+    def trip(self) -> None:
+        """Open the breaker for min(2 ** failures, MAX_COOLDOWN) seconds plus jitter."""
+        self.failures += 1
+        self.last_failure_ts = time.monotonic()
+        cooldown: float = min(2.0 ** self.failures, self.MAX_COOLDOWN)
+        self.open_until = self.last_failure_ts + cooldown * random.uniform(1.0, 1.25)
+        self.state = self.OPEN
+        debug_info("[LLM] Circuit open for %s (%.0fs cool-down)", self.name, cooldown)
+    
+    def reset(self) -> None:
+        """Close the breaker after a successful response."""
+        if self.state != self.CLOSED or self.failures:
+            debug_info("[LLM] Circuit closed for %s", self.name)
+        self.failures = 0
+        self.state = self.CLOSED
+
+
+class _TokenBucket:
+    """
+    Local requests-per-minute limiter for one provider.
+    
+    Tokens refill lazily at rpm / 60 per second. The burst capacity adapts
+    AIMD-style: halved on every 429, grown by one on each success, so the
+    limiter converges on what the provider actually allows.
+    """
+    
+    __slots__ = ("max_capacity", "capacity", "refill_per_sec", "tokens", "last_refill")
+    
+    def __init__(self, rpm: int) -> None:
+        """
+        Initialize a full bucket.
+        
+        Args:
+            rpm (int): Requests per minute the provider allows.
+        """
+        self.max_capacity: float = float(rpm)
+        self.capacity: float = float(rpm)
+        self.refill_per_sec: float = rpm / 60.0
+        self.tokens: float = float(rpm)
+        self.last_refill: float = time.monotonic()
+    
+    def try_acquire(self) -> bool:
+        """
+        Take one token if available.
+        
+        Returns:
+            bool: False if the call would likely be rate limited.
+        """
+        now: float = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_per_sec)
+        self.last_refill = now
+        
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+    
+    def on_rate_limited(self) -> None:
+        """Halve the burst capacity and drain the bucket after a 429."""
+        self.capacity = max(1.0, self.capacity / 2.0)
+        self.tokens = 0.0
+    
+    def on_success(self) -> None:
+        """Grow the burst capacity by one, up to the configured rpm."""
+        if self.capacity < self.max_capacity:
+            self.capacity = min(self.max_capacity, self.capacity + 1.0)
+
+
+# Statuses that mean retrying the provider soon is pointless
+_TRIP_STATUSES: frozenset[LLMStatus] = frozenset({
+    LLMStatus.RATE_LIMITED,
+    LLMStatus.API_KEY_MISSING
+})
+
+
+@lru_cache(maxsize=1)
+def _build_providers() -> tuple[LLMProvider, ...]:
+    """
+    Build the LLM providers sorted by priority.
+    
+    API keys are fixed for the process lifetime, so the tuple is built
+    once and shared by every LLMService instance.
+    
+    Returns:
+        tuple[LLMProvider, ...]: Provider configs sorted by priority.
+    """
+    providers: list[LLMProvider] = []
+    
+    # 0. Ai4Chat (Priority 0 - Primary, Free)
+    providers.append(LLMProvider(
+        name="Ai4Chat",
+        api_key="",  # No key needed
+        base_url=_AI4CHAT_URL,
+        model="ai4chat",
+        priority=0,
+        provider_type="ai4chat"
+    ))
+    
+    # 1. Cerebras (Priority 1 - Best fallback)
+    if _CEREBRAS_API_KEY:
+        providers.append(LLMProvider(
+            name="Cerebras",
+            api_key=_CEREBRAS_API_KEY,
+            base_url="https://api.cerebras.ai/v1",
+            model="llama-3.3-70b",
+            priority=1,
+            provider_type="openai_compatible",
+            rpm=30
+        ))
+    
+    # 2. Groq (Priority 2)
+    if _GROQ_API_KEY:
+        providers.append(LLMProvider(
+            name="Groq",
+            api_key=_GROQ_API_KEY,
+            base_url="https://api.groq.com/openai/v1",
+            model="llama-3.3-70b-versatile",
+            priority=2,
+            provider_type="openai_compatible",
+            rpm=30
+        ))
+    
+    # 3. OpenRouter (Priority 3)
+    if _OPENROUTER_API_KEY:
+        providers.append(LLMProvider(
+            name="OpenRouter",
+            api_key=_OPENROUTER_API_KEY,
+            base_url="https://openrouter.ai/api/v1",
+            model="google/gemma-3-12b-it:free",
+            priority=3,
+            provider_type="openai_compatible",
+            rpm=20
+        ))
+    
+    # 4. Gemini (Priority 4 - Often rate limited)
+    if _GEMINI_API_KEY:
+        providers.append(LLMProvider(
+            name="Gemini",
+            api_key=_GEMINI_API_KEY,
+            base_url=None,
+            model="gemini-1.5-flash",
+            priority=4,
+            provider_type="google",
+            rpm=15
+        ))
+    
+    # Appended in priority order above, so no sort is needed
+    return tuple(providers)
 
 
 class LLMService:
@@ -65,93 +418,172 @@ class LLMService:
     4. Gemini (Often rate limited)
     """
     
-    def __init__(self, temperature: float = 0.7) -> None:
+    __slots__ = (
+        "temperature",
+        "providers",
+        "last_successful_provider",
+        "_cache",
+        "_breakers",
+        "_buckets",
+        "_provider_names",
+        "_http",
+        "_endpoints",
+        "_inflight",
+        "_handlers",
+        "_stream_handlers",
+        "_warmed"
+    )
+    
+    def __init__(self, temperature: float = 0.7, enable_cache: bool = True) -> None:
         """
         Initialize the LLM Service.
         
         Args:
-            temperature (float): Temperature setting for LLM responses.
+            temperature (float): Default temperature for LLM responses.
+            enable_cache (bool): Serve repeated prompts from an in-memory cache.
         """
         self.temperature: float = temperature
-        self.providers: list[LLMProvider] = self._initialize_providers()
+        self._cache: Optional[ResponseCache] = ResponseCache(
+            maxsize=APIConfig.RESPONSE_CACHE_MAXSIZE,
+            ttl=APIConfig.RESPONSE_CACHE_TTL
+        ) if enable_cache else None
+        self.providers: tuple[LLMProvider, ...] = _build_providers()
+        self._breakers: dict[str, _Breaker] = {p.name: _Breaker(p.name) for p in self.providers}
+        self._buckets: dict[str, _TokenBucket] = {
+            p.name: _TokenBucket(p.rpm) for p in self.providers if p.rpm
+        }
+        self._provider_names: tuple[str, ...] = tuple(p.name for p in self.providers)
         self.last_successful_provider: Optional[str] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._endpoints: dict[str, tuple[str, dict[str, str]]] = {}
+        self._inflight: dict[bytes, asyncio.Task[LLMResponse]] = {}
+        self._warmed: bool = False
+        
+        # Query method per provider, resolved from provider_type once here
+        # so dispatch is a single lookup; all share one signature
+        handlers_by_type: dict[str, Callable[[LLMProvider, str, float, Optional[str]], Awaitable[LLMResponse]]] = {
+            "ai4chat": self._query_ai4chat,
+            "google": self._query_gemini,
+            "openai_compatible": self._query_openai_compatible
+        }
+        self._handlers: dict[str, Callable[[LLMProvider, str, float, Optional[str]], Awaitable[LLMResponse]]] = {
+            p.name: handlers_by_type[p.provider_type] for p in self.providers
+        }
+        stream_handlers_by_type: dict[str, Callable[[LLMProvider, str, float, Optional[str]], AsyncIterator[str]]] = {
+            "ai4chat": self._stream_ai4chat,
+            "google": self._stream_gemini,
+            "openai_compatible": self._stream_openai_compatible
+        }
+        self._stream_handlers: dict[str, Callable[[LLMProvider, str, float, Optional[str]], AsyncIterator[str]]] = {
+            p.name: stream_handlers_by_type[p.provider_type] for p in self.providers
+        }
         
-        debug_info(f"[LLM] Service initialized with {len(self.providers)} providers")
+        debug_info("[LLM] Service initialized with %d providers", len(self.providers))
     
-    def _initialize_providers(self) -> list[LLMProvider]:
+    def _get_http_client(self) -> httpx.AsyncClient:
         """
-        Initialize and return list of LLM providers sorted by priority.
+        Get the shared HTTP client, creating it on first use.
+        
+        One long-lived client, shared by every provider, keeps connections
+        alive between queries instead of paying a new TCP + TLS handshake
+        per request. Creation has no await point, so concurrent callers
+        cannot race here.
         
         Returns:
-            list[LLMProvider]: Provider configs sorted by priority.
+            httpx.AsyncClient: The pooled client.
         """
-        providers: list[LLMProvider] = []
+        if self._http is None:
+            self._http = make_client(
+                httpx.Timeout(APIConfig.REQUEST_TIMEOUT, connect=APIConfig.CONNECT_TIMEOUT)
+            )
+        return self._http
+    
+    def _get_endpoint(self, provider: LLMProvider) -> tuple[str, dict[str, str]]:
+        """
+        Get the request URL and headers for a provider, building them once.
         
-        # 0. Ai4Chat (Priority 0 - Primary, Free)
-        providers.append(LLMProvider(
-            name="Ai4Chat",
-            api_key="",  # No key needed
-            base_url="https://yw85opafq6.execute-api.us-east-1.amazonaws.com/default/boss_mode_15aug",
-            model="ai4chat",
-            priority=0,
-            provider_type="ai4chat"
-        ))
+        Both depend only on the provider config, which never changes, so
+        they are memoized per provider instead of rebuilt on every query.
+        
+        Args:
+            provider (LLMProvider): The provider configuration.
+            
+        Returns:
+            tuple[str, dict[str, str]]: Request URL and headers.
+        """
+        endpoint = self._endpoints.get(provider.name)
+        if endpoint is not None:
+            return endpoint
+        
+        if provider.provider_type == "google":
+            url: str = (
+                f"https://generativelanguage.googleapis.com/v1beta/"
+                f"models/{provider.model}:generateContent"
+                f"?key={provider.api_key}"
+            )
+            headers: dict[str, str] = {"Content-Type": "application/json"}
+        else:
+            url = f"{provider.base_url}/chat/completions"
+            headers = {
+                "Authorization": f"Bearer {provider.api_key}",
+                "Content-Type": "application/json"
+            }
+            
+            # OpenRouter requires extra headers
+            if provider.name == "OpenRouter":
+                headers["HTTP-Referer"] = "http://localhost:3000"
+                headers["X-Title"] = "NFLChatbotAPI"
         
-        # 1. Cerebras (Priority 1 - Best fallback)
-        if ConstantsVar.MY_CEREBRAS_API_KEY:
-            providers.append(LLMProvider(
-                name="Cerebras",
-                api_key=ConstantsVar.MY_CEREBRAS_API_KEY,
-                base_url="https://api.cerebras.ai/v1",
-                model="llama-3.3-70b",
-                priority=1,
-                provider_type="openai_compatible"
-            ))
-        
-        # 2. Groq (Priority 2)
-        if ConstantsVar.MY_GROQ_API_KEY:
-            providers.append(LLMProvider(
-                name="Groq",
-                api_key=ConstantsVar.MY_GROQ_API_KEY,
-                base_url="https://api.groq.com/openai/v1",
-                model="llama-3.3-70b-versatile",
-                priority=2,
-                provider_type="openai_compatible"
-            ))
-        
-        # 3. OpenRouter (Priority 3)
-        if ConstantsVar.MY_OPENROUTER_API_KEY:
-            providers.append(LLMProvider(
-                name="OpenRouter",
-                api_key=ConstantsVar.MY_OPENROUTER_API_KEY,
-                base_url="https://openrouter.ai/api/v1",
-                model="google/gemma-3-12b-it:free",
-                priority=3,
-                provider_type="openai_compatible"
-            ))
-        
-        # 4. Gemini (Priority 4 - Often rate limited)
-        if ConstantsVar.MY_GEMINI_API_KEY:
-            providers.append(LLMProvider(
-                name="Gemini",
-                api_key=ConstantsVar.MY_GEMINI_API_KEY,
-                base_url=None,
-                model="gemini-1.5-flash",
-                priority=4,
-                provider_type="google"
-            ))
-        
-        # Sort by priority
-        providers.sort(key=lambda x: x.priority)
-        
-        return providers
-    
-    async def _query_ai4chat(self, prompt: str) -> LLMResponse:
+        endpoint = (url, headers)
+        self._endpoints[provider.name] = endpoint
+        return endpoint
+    
+    async def warmup(self) -> None:
+        """
+        Prepare the HTTP client and resolve the primary provider's host.
+        
+        Meant to run alongside the memory fetch of a chat turn, so that on
+        a cold start the DNS lookup overlaps the Supabase round trip
+        instead of delaying the first LLM call. Only the first call does
+        any work.
+        """
+        self._get_http_client()
+        if self._warmed or not self.providers:
+            return
+        self._warmed = True
+        
+        host: str = httpx.URL(self.providers[0].base_url or _AI4CHAT_URL).host
+        try:
+            await asyncio.get_running_loop().getaddrinfo(host, 443)
+        except OSError as e:
+            debug_warning("[LLM] Warm-up DNS lookup for %s failed: %s", host, e)
+    
+    async def aclose(self) -> None:
+        """
+        Close the shared HTTP client and its pooled connections.
+        
+        Safe to call more than once; a later query opens a fresh client.
+        """
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+            debug_info("[LLM] HTTP client closed")
+    
+    async def _query_ai4chat(
+        self,
+        provider: LLMProvider,
+        prompt: str,
+        temperature: float,
+        system: Optional[str] = None
+    ) -> LLMResponse:
         """
         Query Ai4Chat API (free, no key required).
         
         Args:
+            provider (LLMProvider): The Ai4Chat provider configuration.
             prompt (str): The prompt to send.
+            temperature (float): Unused; Ai4Chat has no temperature setting.
+            system (Optional[str]): Static system prefix, if any.
             
         Returns:
             LLMResponse: Result from Ai4Chat.
@@ -159,25 +591,23 @@ class LLMService:
         debug_info("[Ai4Chat] Attempting query...")
         
         try:
-            async with httpx.AsyncClient(timeout=APIConfig.REQUEST_TIMEOUT) as client:
-                params: dict[str, str] = {
-                    "text": prompt,
-                    "country": "Indonesia",
-                    "user_id": "FalBot_Naufal"
-                }
-                headers: dict[str, str] = {
-                    "User-Agent": "Mozilla/5.0 (Linux; Android 11) Chrome/90.0.0.0",
-                    "Referer": "https://www.ai4chat.co/pages/riddle-generator"
-                }
-                
-                response: httpx.Response = await client.get(
-                    "https://yw85opafq6.execute-api.us-east-1.amazonaws.com/default/boss_mode_15aug",
-                    params=params,
-                    headers=headers
-                )
-                
-                if response.status_code == 200:
-                    content: str = response.text
+            client: httpx.AsyncClient = self._get_http_client()
+            params: dict[str, str] = _ai4chat_params(prompt, system)
+            
+            # Stream the body into one buffer and decode once at the end,
+            # skipping the intermediate copies response.text would make
+            async with client.stream(
+                "GET",
+                _AI4CHAT_URL,
+                params=params,
+                headers=_AI4CHAT_HEADERS
+            ) as response:
+                status_code: int = response.status_code
+                if status_code == 200:
+                    buf: bytearray = bytearray()
+                    async for chunk in response.aiter_bytes():
+                        buf.extend(chunk)
+                    content: str = buf.decode(response.encoding or "utf-8", errors="replace")
                     if content:
                         debug_success("[Ai4Chat] Request successful!")
                         return LLMResponse(
@@ -186,27 +616,34 @@ class LLMService:
                             provider="Ai4Chat",
                             model="ai4chat"
                         )
-                
-                debug_warning(f"[Ai4Chat] Non-200 response: {response.status_code}")
-                return LLMResponse(
-                    status=LLMStatus.ERROR,
-                    content=None,
-                    provider="Ai4Chat",
-                    model="ai4chat",
-                    error_message=f"HTTP {response.status_code}"
-                )
-                
+            
+            debug_warning("[Ai4Chat] Non-200 response: %d", status_code)
+            return LLMResponse(
+                status=LLMStatus.ERROR,
+                content=None,
+                provider="Ai4Chat",
+                model="ai4chat",
+                error_message=f"HTTP {status_code}"
+            )
+            
         except Exception as e:
-            debug_error(f"[Ai4Chat] Error: {str(e)[:100]}")
+            error_msg: str = str(e)
+            debug_error("[Ai4Chat] Error: %.100s", error_msg)
             return LLMResponse(
                 status=LLMStatus.ERROR,
                 content=None,
                 provider="Ai4Chat",
                 model="ai4chat",
-                error_message=str(e)
+                error_message=error_msg
             )
     
-    async def _query_openai_compatible(self, provider: LLMProvider, prompt: str) -> LLMResponse:
+    async def _query_openai_compatible(
+        self,
+        provider: LLMProvider,
+        prompt: str,
+        temperature: float,
+        system: Optional[str] = None
+    ) -> LLMResponse:
         """
         Query an OpenAI-compatible API (Cerebras, Groq, OpenRouter).
         
@@ -215,44 +652,31 @@ class LLMService:
         Args:
             provider (LLMProvider): The provider configuration.
             prompt (str): The prompt to send.
+            temperature (float): Sampling temperature.
+            system (Optional[str]): Static system prefix, if any.
             
         Returns:
             LLMResponse: Result from the provider.
         """
-        debug_info(f"[{provider.name}] Attempting query with model: {provider.model}")
+        debug_info("[%s] Attempting query with model: %s", provider.name, provider.model)
         
         try:
-            headers: dict[str, str] = {
-                "Authorization": f"Bearer {provider.api_key}",
-                "Content-Type": "application/json"
-            }
+            url, headers = self._get_endpoint(provider)
             
-            # OpenRouter requires extra headers
-            if provider.name == "OpenRouter":
-                headers["HTTP-Referer"] = "http://localhost:3000"
-                headers["X-Title"] = "NFLChatbotAPI"
-            
-            payload: dict[str, Any] = {
-                "model": provider.model,
-                "messages": [
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": self.temperature
-            }
+            payload: dict[str, Any] = _openai_payload(provider, prompt, temperature, system)
             
-            async with httpx.AsyncClient(timeout=APIConfig.REQUEST_TIMEOUT) as client:
-                response: httpx.Response = await client.post(
-                    f"{provider.base_url}/chat/completions",
-                    headers=headers,
-                    json=payload
-                )
+            response: httpx.Response = await self._get_http_client().post(
+                url,
+                headers=headers,
+                content=orjson.dumps(payload)
+            )
             
             if response.status_code == 200:
-                data: dict[str, Any] = response.json()
+                data: dict[str, Any] = orjson.loads(response.content)
                 content: str = data["choices"][0]["message"]["content"]
                 
                 if content:
-                    debug_success(f"[{provider.name}] Request successful!")
+                    debug_success("[%s] Request successful!", provider.name)
                     return LLMResponse(
                         status=LLMStatus.SUCCESS,
                         content=content,
@@ -260,7 +684,7 @@ class LLMService:
                         model=provider.model
                     )
                 else:
-                    debug_warning(f"[{provider.name}] Empty response received.")
+                    debug_warning("[%s] Empty response received.", provider.name)
                     return LLMResponse(
                         status=LLMStatus.ERROR,
                         content=None,
@@ -277,54 +701,46 @@ class LLMService:
         except Exception as e:
             return self._classify_exception(provider, e)
     
-    async def _query_gemini(self, provider: LLMProvider, prompt: str) -> LLMResponse:
+    async def _query_gemini(
+        self,
+        provider: LLMProvider,
+        prompt: str,
+        temperature: float,
+        system: Optional[str] = None
+    ) -> LLMResponse:
         """
         Query Google Gemini API using REST endpoint.
         
         Args:
             provider (LLMProvider): The Gemini provider configuration.
             prompt (str): The prompt to send.
+            temperature (float): Sampling temperature.
+            system (Optional[str]): Static system prefix, if any.
             
         Returns:
             LLMResponse: Result from Gemini.
         """
-        debug_info(f"[{provider.name}] Attempting query with model: {provider.model}")
+        debug_info("[%s] Attempting query with model: %s", provider.name, provider.model)
         
         try:
-            url: str = (
-                f"https://generativelanguage.googleapis.com/v1beta/"
-                f"models/{provider.model}:generateContent"
-                f"?key={provider.api_key}"
-            )
+            url, headers = self._get_endpoint(provider)
             
-            payload: dict[str, Any] = {
-                "contents": [
-                    {
-                        "parts": [
-                            {"text": prompt}
-                        ]
-                    }
-                ],
-                "generationConfig": {
-                    "temperature": self.temperature
-                }
-            }
+            payload: dict[str, Any] = _gemini_payload(prompt, temperature, system)
             
-            async with httpx.AsyncClient(timeout=APIConfig.REQUEST_TIMEOUT) as client:
-                response: httpx.Response = await client.post(
-                    url,
-                    headers={"Content-Type": "application/json"},
-                    json=payload
-                )
+            response: httpx.Response = await self._get_http_client().post(
+                url,
+                headers=headers,
+                content=orjson.dumps(payload)
+            )
             
             if response.status_code == 200:
-                data: dict[str, Any] = response.json()
+                data: dict[str, Any] = orjson.loads(response.content)
                 content: str = (
                     data["candidates"][0]["content"]["parts"][0]["text"]
                 )
                 
                 if content:
-                    debug_success(f"[{provider.name}] Request successful!")
+                    debug_success("[%s] Request successful!", provider.name)
                     return LLMResponse(
                         status=LLMStatus.SUCCESS,
                         content=content,
@@ -332,7 +748,7 @@ class LLMService:
                         model=provider.model
                     )
                 else:
-                    debug_warning(f"[{provider.name}] Empty response received.")
+                    debug_warning("[%s] Empty response received.", provider.name)
                     return LLMResponse(
                         status=LLMStatus.ERROR,
                         content=None,
@@ -369,7 +785,7 @@ class LLMService:
         error_msg: str = f"HTTP {status_code}: {error_body}"
         
         if status_code == 429:
-            debug_warning(f"[{provider.name}] Rate limited: {error_msg[:100]}")
+            debug_warning("[%s] Rate limited: %.100s", provider.name, error_msg)
             return LLMResponse(
                 status=LLMStatus.RATE_LIMITED,
                 content=None,
@@ -378,7 +794,7 @@ class LLMService:
                 error_message=error_msg
             )
         elif status_code in (401, 403):
-            debug_error(f"[{provider.name}] API key issue: {error_msg[:100]}")
+            debug_error("[%s] API key issue: %.100s", provider.name, error_msg)
             return LLMResponse(
                 status=LLMStatus.API_KEY_MISSING,
                 content=None,
@@ -387,7 +803,7 @@ class LLMService:
                 error_message=error_msg
             )
         elif status_code == 404:
-            debug_error(f"[{provider.name}] Model not found: {error_msg[:100]}")
+            debug_error("[%s] Model not found: %.100s", provider.name, error_msg)
             return LLMResponse(
                 status=LLMStatus.MODEL_NOT_FOUND,
                 content=None,
@@ -396,7 +812,7 @@ class LLMService:
                 error_message=error_msg
             )
         else:
-            debug_error(f"[{provider.name}] Error: {error_msg[:100]}")
+            debug_error("[%s] Error: %.100s", provider.name, error_msg)
             return LLMResponse(
                 status=LLMStatus.ERROR,
                 content=None,
@@ -416,42 +832,203 @@ class LLMService:
         Returns:
             LLMResponse: Error response with classified status.
         """
-        error_msg: str = str(exc)
+        # Status errors carry the real HTTP code; classify by that, not by text
+        if isinstance(exc, httpx.HTTPStatusError):
+            return self._classify_http_error(
+                provider, exc.response.status_code, exc.response.text[:200]
+            )
         
-        if "429" in error_msg or "rate" in error_msg.lower():
-            debug_warning(f"[{provider.name}] Rate limited: {error_msg[:100]}")
+        # Timeouts often stringify to "", so name the exception type instead
+        if isinstance(exc, httpx.TimeoutException):
+            timeout_msg: str = f"{type(exc).__name__}: provider did not respond in time"
+            debug_warning("[%s] %s", provider.name, timeout_msg)
             return LLMResponse(
-                status=LLMStatus.RATE_LIMITED,
+                status=LLMStatus.ERROR,
                 content=None,
                 provider=provider.name,
                 model=provider.model,
-                error_message=error_msg
+                error_message=timeout_msg
+            )
+        
+        error_msg: str = str(exc)
+        debug_error("[%s] Error: %.100s", provider.name, error_msg)
+        return LLMResponse(
+            status=LLMStatus.ERROR,
+            content=None,
+            provider=provider.name,
+            model=provider.model,
+            error_message=error_msg
+        )
+    
+    async def _dispatch(
+        self,
+        provider: LLMProvider,
+        prompt: str,
+        temperature: float,
+        system: Optional[str] = None
+    ) -> LLMResponse:
+        """
+        Send a prompt to the query method matching the provider type.
+        
+        Args:
+            provider (LLMProvider): The provider to query.
+            prompt (str): The prompt to send.
+            temperature (float): Sampling temperature (Ai4Chat ignores it).
+            system (Optional[str]): Static system prefix, if any.
+            
+        Returns:
+            LLMResponse: Result from the provider.
+        """
+        return await self._handlers[provider.name](provider, prompt, temperature, system)
+    
+    async def _attempt(
+        self,
+        provider: LLMProvider,
+        prompt: str,
+        temperature: float,
+        system: Optional[str] = None
+    ) -> LLMResponse:
+        """
+        Query one provider under a hard overall deadline.
+        
+        The HTTP timeouts only bound each connect or read step, so a slow,
+        trickling provider can still hang far longer; this caps the total.
+        
+        Args:
+            provider (LLMProvider): The provider to query.
+            prompt (str): The prompt to send.
+            temperature (float): Sampling temperature.
+            system (Optional[str]): Static system prefix, if any.
+            
+        Returns:
+            LLMResponse: Result from the provider, or an ERROR on timeout.
+        """
+        try:
+            return await asyncio.wait_for(
+                self._dispatch(provider, prompt, temperature, system),
+                timeout=APIConfig.PROVIDER_DEADLINE_S
             )
-        elif "401" in error_msg or "unauthorized" in error_msg.lower():
-            debug_error(f"[{provider.name}] API key issue: {error_msg[:100]}")
+        except asyncio.TimeoutError:
+            debug_warning("[%s] Deadline of %ss exceeded", provider.name, APIConfig.PROVIDER_DEADLINE_S)
             return LLMResponse(
-                status=LLMStatus.API_KEY_MISSING,
+                status=LLMStatus.ERROR,
                 content=None,
                 provider=provider.name,
                 model=provider.model,
-                error_message=error_msg
+                error_message="deadline exceeded"
             )
-        else:
-            debug_error(f"[{provider.name}] Error: {error_msg[:100]}")
+    
+    async def query(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        hedge_delay_s: Optional[float] = None,
+        system: Optional[str] = None
+    ) -> LLMResponse:
+        """
+        Send a query to the LLM, serving repeated prompts from the cache.
+        
+        Only successful responses are cached, keyed by (system, prompt,
+        temperature).
+        Identical queries that arrive while one is still running share its
+        provider call instead of starting their own.
+        
+        Args:
+            prompt (str): The prompt to send.
+            temperature (Optional[float]): Sampling temperature. Defaults to
+                the service temperature.
+            hedge_delay_s (Optional[float]): Seconds to wait before hedging
+                with the next provider. Defaults to APIConfig.LLM_HEDGE_DELAY.
+            system (Optional[str]): Static instructions or context shared by
+                many requests. Sent as a separate system block so providers
+                with prompt caching can reuse it across requests.
+            
+        Returns:
+            LLMResponse: The cached or freshly generated result.
+        """
+        rejection: Optional[str] = _reject_prompt(prompt, system)
+        if rejection is not None:
+            debug_warning("[LLM] Prompt rejected: %s", rejection)
             return LLMResponse(
                 status=LLMStatus.ERROR,
                 content=None,
-                provider=provider.name,
-                model=provider.model,
-                error_message=error_msg
+                provider="None",
+                model="None",
+                error_message=rejection
             )
+        
+        if temperature is None:
+            temperature = self.temperature
+        
+        key: bytes = ResponseCache.make_key(prompt, temperature, system)
+        
+        if self._cache is not None:
+            cached: Optional[str] = self._cache.get(key)
+            if cached is not None:
+                debug_success("[LLM] Response served from cache")
+                return LLMResponse(
+                    status=LLMStatus.SUCCESS,
+                    content=cached,
+                    provider="cache",
+                    model="cache"
+                )
+        
+        # Single-flight: no await between lookup and insert, so no lock needed
+        task: Optional[asyncio.Task[LLMResponse]] = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._query_providers(prompt, temperature, hedge_delay_s, system))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_query(key, done))
+        else:
+            debug_info("[LLM] Joining identical in-flight query")
+        
+        # Shielded so one caller disconnecting does not cancel the others
+        return await asyncio.shield(task)
+    
+    def _finish_query(self, key: bytes, task: asyncio.Task[LLMResponse]) -> None:
+        """
+        Retire a finished in-flight query and cache its result on success.
+        
+        Runs as the task's done callback, so the response is cached exactly
+        once even when every caller has disconnected before it finished.
+        
+        Args:
+            key (bytes): Cache and single-flight key of the query.
+            task (asyncio.Task[LLMResponse]): The finished query task.
+        """
+        self._inflight.pop(key, None)
+        if self._cache is None or task.cancelled() or task.exception() is not None:
+            return
+        
+        response: LLMResponse = task.result()
+        if response.status == LLMStatus.SUCCESS:
+            self._cache.set(key, response.content)
     
-    async def query(self, prompt: str) -> LLMResponse:
+    async def _query_providers(
+        self,
+        prompt: str,
+        temperature: float,
+        hedge_delay_s: Optional[float] = None,
+        system: Optional[str] = None
+    ) -> LLMResponse:
         """
-        Send a query to the LLM with automatic fallback.
+        Query the providers with automatic, hedged fallback.
+        
+        Providers are tried in priority order, but the next one does not
+        wait for the current one to time out: if no in-flight provider has
+        answered within hedge_delay_s, the next provider is started
+        alongside it. A failure starts the next provider immediately. The
+        first successful response wins and the rest are cancelled.
+        
+        With APIConfig.LLM_RACE_WIDTH above 1, that many providers are
+        raced from the start instead of starting with one.
         
         Args:
             prompt (str): The prompt to send.
+            temperature (float): Sampling temperature.
+            hedge_delay_s (Optional[float]): Seconds to wait before hedging
+                with the next provider. Defaults to APIConfig.LLM_HEDGE_DELAY.
+            system (Optional[str]): Static system prefix, if any.
             
         Returns:
             LLMResponse: The result from the first successful provider.
@@ -465,62 +1042,412 @@ class LLMService:
                 error_message="No providers configured"
             )
         
+        if hedge_delay_s is None:
+            hedge_delay_s = APIConfig.LLM_HEDGE_DELAY
+        
         debug_info("=== LLM Query Started ===")
-        debug_info(f"Prompt: '{prompt[:50]}...'")
+        debug_info("Prompt: '%.50s...'", prompt)
         
-        errors: list[str] = []
+        providers: tuple[LLMProvider, ...] = self.providers
+        breakers: dict[str, _Breaker] = self._breakers
+        buckets: dict[str, _TokenBucket] = self._buckets
+        attempt = self._attempt
+        total: int = len(providers)
+        remaining = iter(enumerate(providers, 1))
+        in_flight: dict[asyncio.Task[LLMResponse], LLMProvider] = {}
         
-        for i, provider in enumerate(self.providers, 1):
-            debug_info(f"Trying provider {i}/{len(self.providers)}: {provider.name}")
-            
-            # Use appropriate query method based on provider type
-            if provider.provider_type == "ai4chat":
-                response: LLMResponse = await self._query_ai4chat(prompt)
-            elif provider.provider_type == "google":
-                response = await self._query_gemini(provider, prompt)
-            else:
-                response = await self._query_openai_compatible(provider, prompt)
-            
-            if response.status == LLMStatus.SUCCESS:
-                self.last_successful_provider = provider.name
-                debug_success(f"=== Query completed via {provider.name} ===")
-                return response
-            else:
-                errors.append(f"{provider.name}: {response.error_message}")
-                debug_warning(f"Provider {provider.name} failed, trying next...")
+        # (provider name, error) pairs; only allocated once something fails
+        # and only joined into a message if every provider does
+        failures: Optional[deque[tuple[str, Optional[str]]]] = None
+        
+        def record_failure(name: str, error: Optional[str]) -> None:
+            """Remember why a provider was skipped or failed."""
+            nonlocal failures
+            if failures is None:
+                failures = deque(maxlen=total)
+            failures.append((name, error))
+        
+        def start_next() -> None:
+            """Start the next provider in priority order, if any is left."""
+            for i, provider in remaining:
+                if breakers[provider.name].is_open():
+                    debug_info("Skipping provider %d/%d: %s (circuit open)", i, total, provider.name)
+                    record_failure(provider.name, "circuit open")
+                    continue
+                
+                bucket: Optional[_TokenBucket] = buckets.get(provider.name)
+                if bucket is not None and not bucket.try_acquire():
+                    debug_info("Skipping provider %d/%d: %s (local rate limit)", i, total, provider.name)
+                    record_failure(provider.name, "local rate limit")
+                    continue
+                
+                debug_info("Trying provider %d/%d: %s", i, total, provider.name)
+                task = asyncio.create_task(attempt(provider, prompt, temperature, system))
+                in_flight[task] = provider
+                return
+        
+        # Race the top providers from the start when enabled (costs quota)
+        for _ in range(max(1, APIConfig.LLM_RACE_WIDTH)):
+            start_next()
+        
+        try:
+            while in_flight:
+                done, _ = await asyncio.wait(
+                    in_flight,
+                    timeout=hedge_delay_s,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                
+                if not done:
+                    # Nothing answered yet: hedge with the next provider
+                    start_next()
+                    continue
+                
+                for task in done:
+                    provider = in_flight.pop(task)
+                    response: LLMResponse = task.result()
+                    breaker: _Breaker = breakers[provider.name]
+                    
+                    bucket = buckets.get(provider.name)
+                    
+                    if response.status == LLMStatus.SUCCESS:
+                        breaker.reset()
+                        if bucket is not None:
+                            bucket.on_success()
+                        self.last_successful_provider = provider.name
+                        debug_success("=== Query completed via %s ===", provider.name)
+                        return response
+                    else:
+                        if response.status in _TRIP_STATUSES:
+                            breaker.trip()
+                        if bucket is not None and response.status == LLMStatus.RATE_LIMITED:
+                            bucket.on_rate_limited()
+                        record_failure(provider.name, response.error_message)
+                        debug_warning("Provider %s failed, trying next...", provider.name)
+                        start_next()
+        finally:
+            # Cancel slower providers once a winner is found (or on cancellation)
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
         
         # All providers failed
         debug_error("=== All providers failed! ===")
+        details: str = "; ".join(f"{name}: {error}" for name, error in failures or ())
         return LLMResponse(
             status=LLMStatus.ERROR,
             content=None,
             provider="All",
             model="All",
-            error_message=f"All providers failed: {'; '.join(errors)}"
+            error_message=f"All providers failed: {details}"
+        )
+    
+    async def _stream_ai4chat(
+        self,
+        provider: LLMProvider,
+        prompt: str,
+        temperature: float,
+        system: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the Ai4Chat plain-text reply as it arrives.
+        
+        Args:
+            provider (LLMProvider): The Ai4Chat provider configuration.
+            prompt (str): The prompt to send.
+            temperature (float): Unused; Ai4Chat has no temperature setting.
+            system (Optional[str]): Static system prefix, if any.
+            
+        Yields:
+            str: Response text chunks.
+            
+        Raises:
+            httpx.HTTPStatusError: If Ai4Chat returns an error status.
+        """
+        async with self._get_http_client().stream(
+            "GET",
+            _AI4CHAT_URL,
+            params=_ai4chat_params(prompt, system),
+            headers=_AI4CHAT_HEADERS
+        ) as response:
+            if response.status_code != 200:
+                await response.aread()
+                response.raise_for_status()
+            
+            async for text in response.aiter_text():
+                if text:
+                    yield text
+    
+    async def _stream_openai_compatible(
+        self,
+        provider: LLMProvider,
+        prompt: str,
+        temperature: float,
+        system: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream an OpenAI-compatible chat completion over SSE.
+        
+        Args:
+            provider (LLMProvider): The provider configuration.
+            prompt (str): The prompt to send.
+            temperature (float): Sampling temperature.
+            system (Optional[str]): Static system prefix, if any.
+            
+        Yields:
+            str: Content deltas in arrival order.
+            
+        Raises:
+            httpx.HTTPStatusError: If the provider returns an error status.
+        """
+        url, headers = self._get_endpoint(provider)
+        payload: dict[str, Any] = _openai_payload(provider, prompt, temperature, system)
+        payload["stream"] = True
+        
+        async with self._get_http_client().stream(
+            "POST",
+            url,
+            headers=headers,
+            content=orjson.dumps(payload)
+        ) as response:
+            if response.status_code != 200:
+                await response.aread()
+                response.raise_for_status()
+            
+            async for line in response.aiter_lines():
+                # Skip blank separators and ": keep-alive" comments
+                if not line.startswith("data: "):
+                    continue
+                data: str = line[6:]
+                if data == "[DONE]":
+                    break
+                
+                choices: list[dict[str, Any]] = orjson.loads(data).get("choices") or []
+                if choices:
+                    delta: Optional[str] = choices[0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+    
+    async def _stream_gemini(
+        self,
+        provider: LLMProvider,
+        prompt: str,
+        temperature: float,
+        system: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a Gemini response through streamGenerateContent over SSE.
+        
+        Args:
+            provider (LLMProvider): The Gemini provider configuration.
+            prompt (str): The prompt to send.
+            temperature (float): Sampling temperature.
+            system (Optional[str]): Static system prefix, if any.
+            
+        Yields:
+            str: Response text chunks.
+            
+        Raises:
+            httpx.HTTPStatusError: If Gemini returns an error status.
+        """
+        url, headers = self._get_endpoint(provider)
+        stream_url: str = url.replace(":generateContent?", ":streamGenerateContent?alt=sse&", 1)
+        
+        async with self._get_http_client().stream(
+            "POST",
+            stream_url,
+            headers=headers,
+            content=orjson.dumps(_gemini_payload(prompt, temperature, system))
+        ) as response:
+            if response.status_code != 200:
+                await response.aread()
+                response.raise_for_status()
+            
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                
+                candidates: list[dict[str, Any]] = orjson.loads(line[6:]).get("candidates") or []
+                if candidates:
+                    for part in candidates[0].get("content", {}).get("parts", ()):
+                        text: Optional[str] = part.get("text")
+                        if text:
+                            yield text
+    
+    async def query_stream(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        system: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response from the first provider that starts answering.
+        
+        Providers are tried one at a time in priority order, skipping open
+        circuits and empty rate-limit buckets. Each wait for the next chunk
+        is capped at APIConfig.PROVIDER_DEADLINE_S, so a stalled provider
+        counts as failed. A provider that fails before producing any text
+        falls through to the next one; once text has been sent there is no
+        switching, so a failure mid-stream raises LLMStreamError. Only a
+        completed stream is stored in the response cache, and a cache hit
+        is yielded as one chunk.
+        
+        Args:
+            prompt (str): The prompt to send.
+            temperature (Optional[float]): Sampling temperature. Defaults to
+                the service temperature.
+            system (Optional[str]): Static system prefix, as in query().
+            
+        Yields:
+            str: Response text chunks. Nothing is yielded if the prompt
+                is rejected or every provider fails.
+            
+        Raises:
+            LLMStreamError: If the provider fails after sending some text;
+                the chunks yielded so far are an incomplete reply.
+        """
+        rejection: Optional[str] = _reject_prompt(prompt, system)
+        if rejection is not None:
+            debug_warning("[LLM] Prompt rejected: %s", rejection)
+            return
+        
+        if temperature is None:
+            temperature = self.temperature
+        
+        key: bytes = ResponseCache.make_key(prompt, temperature, system)
+        if self._cache is not None:
+            cached: Optional[str] = self._cache.get(key)
+            if cached is not None:
+                debug_success("[LLM] Response served from cache")
+                yield cached
+                return
+        
+        debug_info("=== LLM Stream Started ===")
+        
+        for provider in self.providers:
+            breaker: _Breaker = self._breakers[provider.name]
+            if breaker.is_open():
+                continue
+            bucket: Optional[_TokenBucket] = self._buckets.get(provider.name)
+            if bucket is not None and not bucket.try_acquire():
+                continue
+            
+            debug_info("Streaming from provider: %s", provider.name)
+            chunks: list[str] = []
+            stream: AsyncIterator[str] = self._stream_handlers[provider.name](provider, prompt, temperature, system)
+            try:
+                while True:
+                    # Deadline per chunk, as _attempt has per query: the HTTP
+                    # read timeout alone lets a trickling provider hang on
+                    try:
+                        chunk: str = await asyncio.wait_for(
+                            anext(stream),
+                            timeout=APIConfig.PROVIDER_DEADLINE_S
+                        )
+                    except StopAsyncIteration:
+                        break
+                    chunks.append(chunk)
+                    yield chunk
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    debug_warning("[%s] Stream stalled past %ss", provider.name, APIConfig.PROVIDER_DEADLINE_S)
+                else:
+                    status: LLMStatus = self._classify_exception(provider, e).status
+                    if status in _TRIP_STATUSES:
+                        breaker.trip()
+                    if bucket is not None and status == LLMStatus.RATE_LIMITED:
+                        bucket.on_rate_limited()
+                if chunks:
+                    debug_error("[%s] Stream broke off after partial output", provider.name)
+                    raise LLMStreamError(f"{provider.name} stream broke off after partial output") from e
+                debug_warning("Provider %s failed, trying next...", provider.name)
+                continue
+            finally:
+                await stream.aclose()
+            
+            if chunks:
+                breaker.reset()
+                if bucket is not None:
+                    bucket.on_success()
+                self.last_successful_provider = provider.name
+                if self._cache is not None:
+                    self._cache.set(key, "".join(chunks))
+                debug_success("=== Stream completed via %s ===", provider.name)
+                return
+            
+            debug_warning("[%s] Empty stream received, trying next...", provider.name)
+        
+        debug_error("=== All providers failed (stream)! ===")
+    
+    async def summarize(self, messages: list[dict]) -> Optional[str]:
+        """
+        Condense conversation messages into a short summary.
+        
+        Used by MemoryService to fold older history into one row.
+        
+        Args:
+            messages (list[dict]): Messages with "role" and "content", oldest first.
+            
+        Returns:
+            Optional[str]: The summary, or None if every provider failed.
+        """
+        transcript: str = "\n".join(
+            f"{_SUMMARY_ROLE_LABELS.get(m['role'], 'Assistant')}: {m['content']}"
+            for m in messages
         )
+        response: LLMResponse = await self.query(
+            transcript,
+            temperature=0.3,
+            system=_SUMMARY_INSTRUCTIONS
+        )
+        return response.content if response.status == LLMStatus.SUCCESS else None
     
-    def get_available_providers(self) -> list[str]:
+    def get_available_providers(self) -> tuple[str, ...]:
         """
-        Get list of configured provider names.
+        Get the configured provider names.
+        
+        The providers never change after init, so the tuple is built once.
         
         Returns:
-            list[str]: List of provider names.
+            tuple[str, ...]: Provider names in priority order.
         """
-        return [p.name for p in self.providers]
+        return self._provider_names
 
 
 # Singleton instance
 _llm_service: Optional[LLMService] = None
+_llm_service_lock: threading.Lock = threading.Lock()
 
 
 def get_llm_service() -> LLMService:
     """
     Get or create the LLM service singleton.
     
+    Double-checked under a lock so concurrent first calls from worker
+    threads cannot build two services (and two connection pools).
+    
     Returns:
         LLMService: Singleton instance.
     """
     global _llm_service
     if _llm_service is None:
-        _llm_service = LLMService(temperature=APIConfig.DEFAULT_TEMPERATURE)
+        with _llm_service_lock:
+            if _llm_service is None:
+                _llm_service = LLMService(temperature=APIConfig.DEFAULT_TEMPERATURE)
     return _llm_service
+
+
+async def warm_llm_service() -> None:
+    """
+    Build the LLM service and its HTTP pool at startup.
+    
+    Moves the one-off setup cost (service, client, per-provider endpoints)
+    off the first user request. No provider is actually called.
+    """
+    service: LLMService = get_llm_service()
+    await service.warmup()
+    for provider in service.providers:
+        if provider.provider_type != "ai4chat":
+            service._get_endpoint(provider)
+    debug_info("[LLM] Service warmed up")
@@ -5,10 +5,23 @@ This module provides persistent conversation storage using Supabase PostgreSQL.
 Uses httpx for lightweight REST API calls (no SDK dependency).
 """
 
+import asyncio
+from collections.abc import Awaitable, Callable
 from typing import Optional
+
 import httpx
+import orjson
 
 from config import APIConfig, debug_info, debug_warning, debug_error
+from services._http import make_client
+from services.llm_service import get_llm_service
+
+
+# Timeout for Supabase REST calls, in seconds
+_SUPABASE_TIMEOUT: float = 10.0
+
+# Turns a list of {role, content} messages into a short summary (None on failure)
+Summarizer = Callable[[list[dict]], Awaitable[Optional[str]]]
 
 
 class MemoryService:
@@ -19,35 +32,84 @@ class MemoryService:
     Memory persists across server restarts.
     """
     
-    def __init__(self, max_memory_per_user: int = 10) -> None:
+    def __init__(
+        self,
+        max_memory_per_user: int = 10,
+        summarizer: Optional[Summarizer] = None,
+        summarization_threshold: float = 0.8,
+        keep_recent: int = 5
+    ) -> None:
         """
         Initialize the memory service.
         
         Args:
             max_memory_per_user: Maximum messages to keep per user
+            summarizer: Optional callable that condenses older messages; when
+                set, history past the threshold is folded into one summary row
+            summarization_threshold: Share of max_memory_per_user above which
+                older messages are summarized
+            keep_recent: Newest messages always kept verbatim
         """
         self.max_memory: int = max_memory_per_user
+        self.summarizer: Optional[Summarizer] = summarizer
+        self.summarization_threshold: float = summarization_threshold
+        self.keep_recent: int = keep_recent
         self.supabase_url: str = APIConfig.SUPABASE_URL
         self.supabase_key: str = APIConfig.SUPABASE_KEY
+        self._http: Optional[httpx.AsyncClient] = None
+        
+        # Supabase REST headers never change, so build them once
+        self._headers: dict[str, str] = {
+            "apikey": self.supabase_key,
+            "Authorization": f"Bearer {self.supabase_key}",
+            "Content-Type": "application/json",
+            "Prefer": "return=minimal"
+        }
+        # HEAD + count=exact returns the row count in Content-Range, no body
+        self._count_headers: dict[str, str] = {**self._headers, "Prefer": "count=exact"}
+        # Inserts that need the new row's id back
+        self._insert_returning_headers: dict[str, str] = {**self._headers, "Prefer": "return=representation"}
+        self._use_trim_rpc: bool = True  # Cleared if the database lacks the RPC
+        self._use_batch_rpc: bool = True  # Same, for add_messages_with_trim
+        # Latest background write per user; each write waits for the one before
+        self._pending_writes: dict[str, asyncio.Task[None]] = {}
+        # Running summary check per user, kept out of the write chain
+        self._pending_summaries: dict[str, asyncio.Task[None]] = {}
         
         if not self.supabase_url or not self.supabase_key:
             debug_warning("[Memory] Supabase credentials not configured - memory will not persist!")
         else:
-            debug_info(f"[Memory] Service initialized with Supabase (max {max_memory_per_user} messages per user)")
+            debug_info("[Memory] Service initialized with Supabase (max %d messages per user)", max_memory_per_user)
     
-    def _get_headers(self) -> dict[str, str]:
+    def _get_http_client(self) -> httpx.AsyncClient:
         """
-        Get HTTP headers for Supabase REST API.
+        Get the shared Supabase HTTP client, creating it on first use.
+        
+        Reusing one pooled client keeps connections to Supabase alive
+        instead of opening a new one for every REST call.
         
         Returns:
-            dict: Headers with API key and authorization
+            httpx.AsyncClient: The pooled client.
         """
-        return {
-            "apikey": self.supabase_key,
-            "Authorization": f"Bearer {self.supabase_key}",
-            "Content-Type": "application/json",
-            "Prefer": "return=minimal"
-        }
+        if self._http is None:
+            self._http = make_client(_SUPABASE_TIMEOUT)
+        return self._http
+    
+    async def aclose(self) -> None:
+        """
+        Flush background writes, then close the shared HTTP client.
+        
+        Safe to call more than once; a later call opens a fresh client.
+        """
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes.values(), return_exceptions=True)
+        if self._pending_summaries:
+            await asyncio.gather(*self._pending_summaries.values(), return_exceptions=True)
+        
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+            debug_info("[Memory] HTTP client closed")
     
     async def add_message(self, user_id: str, role: str, content: str) -> None:
         """
@@ -59,32 +121,331 @@ class MemoryService:
             content: The message content
         """
         if not self.supabase_url or not self.supabase_key:
-            debug_warning(f"[Memory] Skipping save - Supabase not configured")
+            debug_warning("[Memory] Skipping save - Supabase not configured")
             return
         
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                # Insert new message
-                response: httpx.Response = await client.post(
-                    f"{self.supabase_url}/rest/v1/chat_memory",
-                    headers=self._get_headers(),
-                    json={
-                        "user_id": user_id,
-                        "role": role,
-                        "content": content
-                    }
+            client: httpx.AsyncClient = self._get_http_client()
+            
+            # Insert + trim in a single round trip when the RPC is installed
+            if self._use_trim_rpc:
+                rpc_response: httpx.Response = await client.post(
+                    f"{self.supabase_url}/rest/v1/rpc/add_message_with_trim",
+                    headers=self._headers,
+                    content=orjson.dumps({
+                        "p_uid": user_id,
+                        "p_role": role,
+                        "p_content": content,
+                        "p_max": self.max_memory
+                    })
                 )
                 
-                if response.status_code == 201:
-                    debug_info(f"[Memory] Added {role} message for user {user_id[:8]}...")
-                    
-                    # Cleanup old messages if exceeds max
-                    await self._cleanup_old_messages(user_id)
+                if rpc_response.status_code in (200, 204):
+                    debug_info("[Memory] Added %s message for user %.8s...", role, user_id)
+                    return
+                elif rpc_response.status_code == 404:
+                    debug_warning("[Memory] add_message_with_trim RPC not found - falling back to insert + cleanup")
+                    self._use_trim_rpc = False
+                else:
+                    debug_error("[Memory] Failed to add message: HTTP %d", rpc_response.status_code)
+                    return
+            
+            # Insert new message
+            response: httpx.Response = await client.post(
+                f"{self.supabase_url}/rest/v1/chat_memory",
+                headers=self._headers,
+                content=orjson.dumps({
+                    "user_id": user_id,
+                    "role": role,
+                    "content": content
+                })
+            )
+            
+            if response.status_code == 201:
+                debug_info("[Memory] Added %s message for user %.8s...", role, user_id)
+                
+                # Cleanup old messages if exceeds max
+                await self._cleanup_old_messages(user_id)
+            else:
+                debug_error("[Memory] Failed to add message: HTTP %d", response.status_code)
+                
+        except Exception as e:
+            debug_error("[Memory] Error adding message: %.100s", e)
+    
+    async def add_messages(self, user_id: str, messages: list[tuple[str, str]]) -> None:
+        """
+        Add several messages to a user's history in one round trip.
+        
+        Uses the add_messages_with_trim RPC, which inserts every message
+        and trims once. Falls back to one add_message per message when the
+        RPC is not installed.
+        
+        Args:
+            user_id: Unique user identifier
+            messages: (role, content) pairs, oldest first
+        """
+        if len(messages) == 1:
+            await self.add_message(user_id, *messages[0])
+            return
+        
+        if not self.supabase_url or not self.supabase_key:
+            debug_warning("[Memory] Skipping save - Supabase not configured")
+            return
+        
+        if self._use_batch_rpc:
+            try:
+                response: httpx.Response = await self._get_http_client().post(
+                    f"{self.supabase_url}/rest/v1/rpc/add_messages_with_trim",
+                    headers=self._headers,
+                    content=orjson.dumps({
+                        "p_uid": user_id,
+                        "p_messages": [{"role": role, "content": content} for role, content in messages],
+                        "p_max": self.max_memory
+                    })
+                )
+                
+                if response.status_code in (200, 204):
+                    debug_info("[Memory] Added %d messages for user %.8s...", len(messages), user_id)
+                    return
+                elif response.status_code == 404:
+                    debug_warning("[Memory] add_messages_with_trim RPC not found - writing messages one by one")
+                    self._use_batch_rpc = False
                 else:
-                    debug_error(f"[Memory] Failed to add message: HTTP {response.status_code}")
+                    debug_error("[Memory] Failed to add messages: HTTP %d", response.status_code)
+                    return
                     
+            except Exception as e:
+                debug_error("[Memory] Error adding messages: %.100s", e)
+                return
+        
+        for role, content in messages:
+            await self.add_message(user_id, role, content)
+    
+    def add_message_nowait(self, user_id: str, role: str, content: str) -> None:
+        """
+        Schedule add_message in the background and return immediately.
+        
+        Writes for the same user are chained, so they still land in the
+        order they were scheduled. Must be called from a running event loop.
+        
+        Args:
+            user_id: Unique user identifier
+            role: Either 'user' or 'assistant'
+            content: The message content
+        """
+        self.add_messages_nowait(user_id, [(role, content)])
+    
+    def add_messages_nowait(self, user_id: str, messages: list[tuple[str, str]]) -> None:
+        """
+        Schedule add_messages in the background and return immediately.
+        
+        Chained with the user's other background writes like
+        add_message_nowait. Must be called from a running event loop.
+        
+        Args:
+            user_id: Unique user identifier
+            messages: (role, content) pairs, oldest first
+        """
+        previous: Optional[asyncio.Task[None]] = self._pending_writes.get(user_id)
+        task: asyncio.Task[None] = asyncio.create_task(
+            self._add_messages_after(previous, user_id, messages)
+        )
+        self._pending_writes[user_id] = task
+        task.add_done_callback(lambda t: self._on_write_done(user_id, t))
+    
+    async def _add_messages_after(
+        self,
+        previous: Optional[asyncio.Task[None]],
+        user_id: str,
+        messages: list[tuple[str, str]]
+    ) -> None:
+        """
+        Run add_messages once the user's previous background write is done.
+        
+        Args:
+            previous: The write scheduled before this one, if still pending
+            user_id: Unique user identifier
+            messages: (role, content) pairs, oldest first
+        """
+        if previous is not None:
+            # wait() instead of await so a failed earlier write is not re-raised
+            await asyncio.wait((previous,))
+        await self.add_messages(user_id, messages)
+        
+        # A turn ends with the assistant reply; check the history size then
+        if messages[-1][0] == "assistant" and self.summarizer is not None:
+            self._schedule_summary(user_id)
+    
+    def _schedule_summary(self, user_id: str) -> None:
+        """
+        Start a background summary check for a user unless one is running.
+        
+        The check runs beside the write chain, not in it, so flush() and
+        the reads behind it never wait on the summarizer's LLM call.
+        
+        Args:
+            user_id: Unique user identifier
+        """
+        if user_id in self._pending_summaries:
+            return
+        
+        task: asyncio.Task[None] = asyncio.create_task(self._summarize_if_needed(user_id))
+        self._pending_summaries[user_id] = task
+        task.add_done_callback(lambda _: self._pending_summaries.pop(user_id, None))
+    
+    async def _summarize_if_needed(self, user_id: str) -> None:
+        """
+        Fold a user's older messages into a single summary row.
+        
+        Once the history grows past summarization_threshold of max_memory,
+        everything but the keep_recent newest messages (including any
+        earlier summary) is summarized. The summary is stored with the
+        oldest replaced message's timestamp, so it sorts first, and the
+        replaced rows are deleted. Trimming never removes summary rows.
+        If the replaced rows cannot be deleted, the summary is removed
+        again so the history is not duplicated.
+        
+        Args:
+            user_id: Unique user identifier
+        """
+        summarizer: Optional[Summarizer] = self.summarizer
+        if summarizer is None or not self.supabase_url or not self.supabase_key:
+            return
+        
+        try:
+            client: httpx.AsyncClient = self._get_http_client()
+            url: str = f"{self.supabase_url}/rest/v1/chat_memory"
+            response: httpx.Response = await client.get(
+                url,
+                params={
+                    "user_id": f"eq.{user_id}",
+                    "select": "id,role,content,created_at",
+                    "order": "created_at.asc,id.asc"
+                },
+                headers=self._headers
+            )
+            if response.status_code != 200:
+                return
+            
+            rows: list[dict] = orjson.loads(response.content)
+            if len(rows) <= self.max_memory * self.summarization_threshold:
+                return
+            
+            old_rows: list[dict] = rows[:-self.keep_recent] if self.keep_recent else rows
+            if len(old_rows) < 2:
+                return  # Nothing to gain from summarizing a single row
+            
+            summary: Optional[str] = await summarizer(
+                [{"role": row["role"], "content": row["content"]} for row in old_rows]
+            )
+            if not summary:
+                return
+            
+            insert_response: httpx.Response = await client.post(
+                url,
+                headers=self._insert_returning_headers,
+                content=orjson.dumps({
+                    "user_id": user_id,
+                    "role": "summary",
+                    "content": summary,
+                    "created_at": old_rows[0]["created_at"]
+                })
+            )
+            if insert_response.status_code != 201:
+                debug_warning(
+                    "[Memory] Could not store summary: HTTP %d - does chat_memory allow role 'summary'?",
+                    insert_response.status_code
+                )
+                if insert_response.status_code == 400:
+                    self.summarizer = None  # Schema rejects it; stop trying
+                return
+            
+            delete_response: httpx.Response = await client.delete(
+                url,
+                params={"id": f"in.({','.join(str(row['id']) for row in old_rows)})"},
+                headers=self._headers
+            )
+            if delete_response.status_code not in (200, 204):
+                # Summary and originals side by side would repeat the history
+                summary_id: int = orjson.loads(insert_response.content)[0]["id"]
+                rollback_response: httpx.Response = await client.delete(
+                    url,
+                    params={"id": f"eq.{summary_id}"},
+                    headers=self._headers
+                )
+                debug_error(
+                    "[Memory] Could not delete summarized messages: HTTP %d (summary %s)",
+                    delete_response.status_code,
+                    "rolled back" if rollback_response.status_code in (200, 204) else "left in place"
+                )
+                return
+            debug_info("[Memory] Summarized %d messages for user %.8s...", len(old_rows), user_id)
+            
         except Exception as e:
-            debug_error(f"[Memory] Error adding message: {str(e)[:100]}")
+            debug_error("[Memory] Error summarizing memory: %.100s", e)
+    
+    async def flush(self, user_id: str, summaries: bool = False) -> None:
+        """
+        Wait until every background write queued for a user has landed.
+        
+        Writes are chained, so waiting on the latest one covers them all.
+        Routes run this as a response background task: on serverless hosts
+        the invocation may be frozen once the request ends, and a write
+        still queued then would be lost.
+        
+        Args:
+            user_id: Unique user identifier
+            summaries: Also wait for a running summary check. Reads skip
+                it; it only folds history that is already stored.
+        """
+        pending: Optional[asyncio.Task[None]] = self._pending_writes.get(user_id)
+        if pending is not None:
+            # wait() instead of await so a failed write is not re-raised
+            await asyncio.wait((pending,))
+        
+        if summaries:
+            summary_task: Optional[asyncio.Task[None]] = self._pending_summaries.get(user_id)
+            if summary_task is not None:
+                await asyncio.wait((summary_task,))
+    
+    def _on_write_done(self, user_id: str, task: asyncio.Task[None]) -> None:
+        """
+        Drop a finished background write and log anything it raised.
+        
+        Args:
+            user_id: User identifier the write belonged to
+            task: The finished write
+        """
+        if self._pending_writes.get(user_id) is task:
+            del self._pending_writes[user_id]
+        
+        if not task.cancelled() and task.exception() is not None:
+            debug_error("[Memory] Background write failed: %.100s", task.exception())
+    
+    async def _count_messages(self, client: httpx.AsyncClient, user_id: str) -> Optional[int]:
+        """
+        Count a user's stored messages without transferring any rows.
+        
+        Args:
+            client: The shared HTTP client
+            user_id: User identifier
+            
+        Returns:
+            Message count, or None if Supabase did not return one
+        """
+        response: httpx.Response = await client.head(
+            f"{self.supabase_url}/rest/v1/chat_memory",
+            params={"user_id": f"eq.{user_id}"},
+            headers=self._count_headers
+        )
+        
+        # Content-Range looks like "0-9/10" (or "*/0" when empty)
+        content_range: Optional[str] = response.headers.get("content-range")
+        if response.status_code not in (200, 206) or not content_range:
+            return None
+        
+        total: str = content_range.rpartition("/")[2]
+        return int(total) if total.isdigit() else None
     
     async def _cleanup_old_messages(self, user_id: str) -> None:
         """
@@ -94,53 +455,43 @@ class MemoryService:
             user_id: User identifier
         """
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                # Count messages for this user
-                count_response: httpx.Response = await client.get(
-                    f"{self.supabase_url}/rest/v1/chat_memory",
-                    params={
-                        "user_id": f"eq.{user_id}",
-                        "select": "id"
-                    },
-                    headers=self._get_headers()
-                )
-                
-                if count_response.status_code == 200:
-                    messages: list = count_response.json()
-                    count: int = len(messages)
+            client: httpx.AsyncClient = self._get_http_client()
+            # Count messages for this user
+            count: Optional[int] = await self._count_messages(client, user_id)
+            
+            if count is not None:
+                if count > self.max_memory:
+                    # Delete oldest messages
+                    to_delete: int = count - self.max_memory
+                    
+                    # Get IDs of oldest messages; the summary row is never trimmed
+                    oldest_response: httpx.Response = await client.get(
+                        f"{self.supabase_url}/rest/v1/chat_memory",
+                        params={
+                            "user_id": f"eq.{user_id}",
+                            "role": "neq.summary",
+                            "select": "id",
+                            "order": "created_at.asc",
+                            "limit": str(to_delete)
+                        },
+                        headers=self._headers
+                    )
                     
-                    if count > self.max_memory:
-                        # Delete oldest messages
-                        to_delete: int = count - self.max_memory
+                    if oldest_response.status_code == 200:
+                        oldest_ids: list = orjson.loads(oldest_response.content)
+                        ids_to_delete: list[int] = [msg["id"] for msg in oldest_ids]
                         
-                        # Get IDs of oldest messages
-                        oldest_response: httpx.Response = await client.get(
+                        # Delete all of them in one round trip with an in.(...) filter
+                        await client.delete(
                             f"{self.supabase_url}/rest/v1/chat_memory",
-                            params={
-                                "user_id": f"eq.{user_id}",
-                                "select": "id",
-                                "order": "created_at.asc",
-                                "limit": str(to_delete)
-                            },
-                            headers=self._get_headers()
+                            params={"id": f"in.({','.join(map(str, ids_to_delete))})"},
+                            headers=self._headers
                         )
                         
-                        if oldest_response.status_code == 200:
-                            oldest_ids: list = oldest_response.json()
-                            ids_to_delete: list[int] = [msg["id"] for msg in oldest_ids]
-                            
-                            # Delete by IDs
-                            for msg_id in ids_to_delete:
-                                await client.delete(
-                                    f"{self.supabase_url}/rest/v1/chat_memory",
-                                    params={"id": f"eq.{msg_id}"},
-                                    headers=self._get_headers()
-                                )
-                            
-                            debug_info(f"[Memory] Cleaned up {to_delete} old messages for user {user_id[:8]}...")
-                            
+                        debug_info("[Memory] Cleaned up %d old messages for user %.8s...", to_delete, user_id)
+                        
         except Exception as e:
-            debug_error(f"[Memory] Error during cleanup: {str(e)[:100]}")
+            debug_error("[Memory] Error during cleanup: %.100s", e)
     
     async def get_memory(self, user_id: str) -> list[dict]:
         """
@@ -153,41 +504,46 @@ class MemoryService:
             List of message dictionaries
         """
         if not self.supabase_url or not self.supabase_key:
-            debug_warning(f"[Memory] Skipping get - Supabase not configured")
+            debug_warning("[Memory] Skipping get - Supabase not configured")
             return []
         
+        # Read after the user's queued writes, or the last turn could be missing
+        await self.flush(user_id)
+        
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response: httpx.Response = await client.get(
-                    f"{self.supabase_url}/rest/v1/chat_memory",
-                    params={
-                        "user_id": f"eq.{user_id}",
-                        "select": "role,content,created_at",
-                        "order": "created_at.asc",
-                        "limit": str(self.max_memory)
-                    },
-                    headers=self._get_headers()
-                )
+            client: httpx.AsyncClient = self._get_http_client()
+            response: httpx.Response = await client.get(
+                f"{self.supabase_url}/rest/v1/chat_memory",
+                params={
+                    "user_id": f"eq.{user_id}",
+                    "select": "role,content,created_at",
+                    # Newest first so the limit keeps the latest window,
+                    # not the oldest rows; reversed below to oldest-first
+                    "order": "created_at.desc,id.desc",
+                    "limit": str(self.max_memory)
+                },
+                headers=self._headers
+            )
+            
+            if response.status_code == 200:
+                messages: list[dict] = orjson.loads(response.content)
+                
+                # Convert Supabase format to memory format, in chronological order
+                formatted_messages: list[dict] = []
+                for msg in reversed(messages):
+                    formatted_messages.append({
+                        "role": msg["role"],
+                        "content": msg["content"],
+                        "timestamp": msg["created_at"]
+                    })
+                
+                return formatted_messages
+            else:
+                debug_error("[Memory] Failed to get memory: HTTP %d", response.status_code)
+                return []
                 
-                if response.status_code == 200:
-                    messages: list[dict] = response.json()
-                    
-                    # Convert Supabase format to memory format
-                    formatted_messages: list[dict] = []
-                    for msg in messages:
-                        formatted_messages.append({
-                            "role": msg["role"],
-                            "content": msg["content"],
-                            "timestamp": msg["created_at"]
-                        })
-                    
-                    return formatted_messages
-                else:
-                    debug_error(f"[Memory] Failed to get memory: HTTP {response.status_code}")
-                    return []
-                    
         except Exception as e:
-            debug_error(f"[Memory] Error getting memory: {str(e)[:100]}")
+            debug_error("[Memory] Error getting memory: %.100s", e)
             return []
     
     async def get_memory_length(self, user_id: str) -> int:
@@ -203,24 +559,15 @@ class MemoryService:
         if not self.supabase_url or not self.supabase_key:
             return 0
         
+        # Count after the user's queued writes so the number includes them
+        await self.flush(user_id)
+        
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response: httpx.Response = await client.get(
-                    f"{self.supabase_url}/rest/v1/chat_memory",
-                    params={
-                        "user_id": f"eq.{user_id}",
-                        "select": "id"
-                    },
-                    headers=self._get_headers()
-                )
+            count: Optional[int] = await self._count_messages(self._get_http_client(), user_id)
+            return count if count is not None else 0
                 
-                if response.status_code == 200:
-                    return len(response.json())
-                else:
-                    return 0
-                    
         except Exception as e:
-            debug_error(f"[Memory] Error getting memory length: {str(e)[:100]}")
+            debug_error("[Memory] Error getting memory length: %.100s", e)
             return 0
     
     async def clear_memory(self, user_id: str) -> int:
@@ -234,29 +581,33 @@ class MemoryService:
             Number of messages cleared
         """
         if not self.supabase_url or not self.supabase_key:
-            debug_warning(f"[Memory] Skipping clear - Supabase not configured")
+            debug_warning("[Memory] Skipping clear - Supabase not configured")
             return 0
         
+        # Let queued writes and summaries land first so none of them
+        # reappear after the clear
+        await self.flush(user_id, summaries=True)
+        
         try:
             # Get count first
             count: int = await self.get_memory_length(user_id)
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response: httpx.Response = await client.delete(
-                    f"{self.supabase_url}/rest/v1/chat_memory",
-                    params={"user_id": f"eq.{user_id}"},
-                    headers=self._get_headers()
-                )
+            client: httpx.AsyncClient = self._get_http_client()
+            response: httpx.Response = await client.delete(
+                f"{self.supabase_url}/rest/v1/chat_memory",
+                params={"user_id": f"eq.{user_id}"},
+                headers=self._headers
+            )
+            
+            if response.status_code in (200, 204):
+                debug_info("[Memory] Cleared %d messages for user %.8s...", count, user_id)
+                return count
+            else:
+                debug_error("[Memory] Failed to clear memory: HTTP %d", response.status_code)
+                return 0
                 
-                if response.status_code in (200, 204):
-                    debug_info(f"[Memory] Cleared {count} messages for user {user_id[:8]}...")
-                    return count
-                else:
-                    debug_error(f"[Memory] Failed to clear memory: HTTP {response.status_code}")
-                    return 0
-                    
         except Exception as e:
-            debug_error(f"[Memory] Error clearing memory: {str(e)[:100]}")
+            debug_error("[Memory] Error clearing memory: %.100s", e)
             return 0
 
 
@@ -273,5 +624,10 @@ def get_memory_service() -> MemoryService:
     """
     global _memory_service
     if _memory_service is None:
-        _memory_service = MemoryService(max_memory_per_user=APIConfig.MAX_MEMORY_LENGTH)
+        _memory_service = MemoryService(
+            max_memory_per_user=APIConfig.MAX_MEMORY_LENGTH,
+            summarizer=get_llm_service().summarize if APIConfig.ENABLE_MEMORY_SUMMARY else None,
+            summarization_threshold=APIConfig.MEMORY_SUMMARY_THRESHOLD,
+            keep_recent=APIConfig.MEMORY_KEEP_RECENT
+        )
     return _memory_service
@@ -5,15 +5,90 @@ This module provides RAG functionality with knowledge base loading,
 time-based activity detection, and augmented prompt building.
 """
 
+import asyncio
+import hashlib
 import os
 import random
-from datetime import datetime
-from typing import Optional
-from zoneinfo import ZoneInfo
+import time
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, ClassVar, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from config import APIConfig, debug_info, debug_error, debug_warning
 from services.llm_service import get_llm_service, LLMResponse, LLMStatus
 from services.memory_service import get_memory_service
+from services.response_cache import ResponseCache
+
+
+# Knowledge base text by (path, mtime_ns), so a new RAGService only
+# re-reads the file after it changes
+_KB_CACHE: dict[tuple[str, int], str] = {}
+
+# Indonesian day names, indexed by datetime.weekday() (0 = Monday)
+_DAY_NAMES_ID: tuple[str, ...] = ('Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu')
+
+# Per-request RAG prompt, written without surrounding whitespace so the
+# rendered result needs no strip(); everything static lives in system_prompt
+_PROMPT_TEMPLATE: str = (
+    "=== CONTEXT ===\n"
+    "Waktu: {date}, {time} WIB\n"
+    "Status aktivitas Naufal: {activity}\n"
+    "Mood kamu sekarang: {mood}\n"
+    "\n"
+    "{memory}=== PERTANYAAN USER ===\n"
+    "{query}\n"
+    "\n"
+    "=== JAWABAN (kreatif, santai, JANGAN template) ==="
+)
+
+# Speaker labels for history lines; any other role is the bot itself
+_ROLE_LABELS: dict[str, str] = {"user": "User", "summary": "Ringkasan obrolan sebelumnya"}
+
+
+def _load_wib() -> tzinfo:
+    """
+    Resolve the WIB timezone once at import.
+    
+    Returns:
+        tzinfo: Asia/Jakarta, or a fixed UTC+7 offset if tzdata is missing
+            (WIB has no DST, so the two are equivalent)
+    """
+    try:
+        return ZoneInfo("Asia/Jakarta")
+    except ZoneInfoNotFoundError:
+        return timezone(timedelta(hours=7), "WIB")
+
+
+def _classify_activity(hour: int, is_weekend: bool) -> str:
+    """
+    Map an hour of the day to Naufal's activity.
+    
+    Only used to build RAGService._ACTIVITY_TABLE at import.
+    
+    Args:
+        hour: Hour of the day in WIB (0-23)
+        is_weekend: Whether the day is Saturday or Sunday
+        
+    Returns:
+        str: Activity status
+    """
+    # 23:00 - 06:00: Tidur
+    if hour >= 23 or hour < 6:
+        return "Tidur"
+    
+    # Weekend: Liburan
+    if is_weekend:
+        return "Liburan / Free Time"
+    
+    # Weekday 07:00 - 19:00: Kerja
+    if 7 <= hour < 19:
+        return "Bekerja (AI Engineer)"
+    
+    # Weekday 19:00 - 23:00: Kuliah S2
+    if 19 <= hour < 23:
+        return "Kuliah S2 / Belajar"
+    
+    return "Free Time"
 
 
 class RAGService:
@@ -23,14 +98,53 @@ class RAGService:
     Handles knowledge base loading, context building, and query processing.
     """
     
+    _WIB: ClassVar[tzinfo] = _load_wib()
+    _MONTHS_ID: ClassVar[tuple[str, ...]] = (
+        "Januari", "Februari", "Maret", "April", "Mei", "Juni",
+        "Juli", "Agustus", "September", "Oktober", "November", "Desember"
+    )
+    _MOODS: ClassVar[tuple[str, ...]] = (
+        "Lagi semangat dan energik 🔥",
+        "Santai dan chill vibes aja",
+        "Agak iseng dan suka bercanda hari ini",
+        "Lagi kalem dan thoughtful",
+        "Excited banget, lagi good mood!",
+        "Agak random dan playful",
+        "Lagi fokus tapi tetap friendly",
+        "Vibes-nya warm dan supportive",
+        "Lagi seru-serunya, high energy",
+        "Chill tapi informatif",
+    )
+    # Private generator (OS-seeded) so mood picks don't share state with
+    # other users of the global random module
+    _RNG: ClassVar[random.Random] = random.Random()
+    # Activity per hour, indexed [hour][is_weekend]
+    _ACTIVITY_TABLE: ClassVar[tuple[tuple[str, str], ...]] = tuple(
+        (_classify_activity(hour, False), _classify_activity(hour, True))
+        for hour in range(24)
+    )
+    
     def __init__(self) -> None:
         """Initialize the RAG service."""
         self.knowledge_base: str = self._load_knowledge_base()
+        self.system_prompt: str = self._build_system_prompt()
+        # (epoch minute, time_info, activity_status) of the last lookup
+        self._time_cache: tuple[int, dict, str] = (-1, {}, "")
         self.llm_service = get_llm_service()
         self.memory_service = get_memory_service()
         
+        # Answers keyed by question + context, when enabled (None = disabled)
+        self._prompt_cache: Optional[ResponseCache] = (
+            ResponseCache(
+                maxsize=APIConfig.PROMPT_CACHE_MAXSIZE,
+                ttl=APIConfig.PROMPT_CACHE_TTL
+            )
+            if APIConfig.ENABLE_PROMPT_CACHE
+            else None
+        )
+        
         debug_info("[RAG] Service initialized")
-        debug_info(f"[RAG] Knowledge base length: {len(self.knowledge_base)} characters")
+        debug_info("[RAG] Knowledge base length: %d characters", len(self.knowledge_base))
     
     def _load_knowledge_base(self) -> str:
         """
@@ -42,19 +156,65 @@ class RAGService:
         try:
             kb_path: str = APIConfig.KNOWLEDGE_BASE_PATH
             
-            if os.path.exists(kb_path):
-                with open(kb_path, 'r', encoding='utf-8') as f:
-                    content: str = f.read()
-                debug_info(f"[RAG] Loaded knowledge base from {kb_path}")
-                return content
-            else:
-                debug_warning(f"[RAG] Knowledge base not found at {kb_path}")
+            # One stat both checks existence and yields the cache key
+            try:
+                key: tuple[str, int] = (kb_path, os.stat(kb_path).st_mtime_ns)
+            except FileNotFoundError:
+                debug_warning("[RAG] Knowledge base not found at %s", kb_path)
                 return self._get_default_knowledge_base()
+            
+            cached: Optional[str] = _KB_CACHE.get(key)
+            if cached is not None:
+                return cached
+            
+            with open(kb_path, 'r', encoding='utf-8') as f:
+                content: str = f.read()
+            _KB_CACHE.clear()  # Only the current version is worth keeping
+            _KB_CACHE[key] = content
+            debug_info("[RAG] Loaded knowledge base from %s", kb_path)
+            return content
                 
         except Exception as e:
-            debug_error(f"[RAG] Error loading knowledge base: {e}")
+            debug_error("[RAG] Error loading knowledge base: %s", e)
             return self._get_default_knowledge_base()
     
+    def _build_system_prompt(self) -> str:
+        """
+        Build the static system prompt: knowledge base plus instructions.
+        
+        Nothing in here changes per request, so it is built once and sent
+        as the system block, letting providers cache it as a shared prefix.
+        
+        Returns:
+            str: System prompt text
+        """
+        return f"""
+=== KNOWLEDGE BASE ===
+{self.knowledge_base}
+
+=== INSTRUKSI ===
+Kamu adalah fal bot, representasi digital dari Naufal. Jawab berdasarkan Knowledge Base di atas dan CONTEXT di pesan user.
+
+ATURAN KREATIVITAS (WAJIB!):
+1. Gaya bahasa SANTAI dan KASUAL — kayak chat sama teman.
+2. WAJIB VARIASI: JANGAN pernah menjawab dengan kalimat yang persis sama. Selalu parafrase, ubah struktur kalimat, dan variasikan ekspresi.
+3. Variasikan kata pembuka ("Nah", "Btw", "Oh itu", "Wah", "Jadi gini", "Hmm", dll). JANGAN selalu mulai dengan "Aku...".
+4. Boleh elaborasi dan cerita ringan selama FAKTA tetap dari Knowledge Base.
+5. Sesuaikan mood jawaban dengan Mood di CONTEXT.
+6. Pertanyaan singkat → jawab singkat. Pertanyaan detail → jawab detail.
+7. Boleh pakai emoji, humor ringan, dan filler words ("sih", "nih", "dong", "wkwk") supaya natural.
+
+GUARDRAILS:
+- Jika pertanyaan tentang aktivitas/jadwal, gunakan Status Aktivitas di CONTEXT.
+- JANGAN mengarang fakta yang tidak ada di Knowledge Base.
+- HANDLING PERTANYAAN:
+  * Simple/Ambiguous (\"test\", \"hai\", \"halo\") → Jawab NATURAL dan friendly, jangan langsung tolak! Contoh: \"Halo! Ada yang bisa dibantu? 😊\"
+  * General Questions (masih wajar) → Coba jawab dengan redirect ke Knowledge Base atau logika umum
+  * Sensitive/Personal ONLY (pacar, alamat, politik, agama) → Baru tolak dengan SANTAI dan VARIASI kalimatnya
+- KEY: Jangan terlalu cepat tolak! Prioritaskan friendly engagement dulu.
+- Pertimbangkan riwayat percakapan untuk konteks.
+""".strip()
+    
     def _get_default_knowledge_base(self) -> str:
         """
         Get default fallback knowledge base.
@@ -76,36 +236,49 @@ Jika ada pertanyaan di luar konteks, jawab:
 "Wah aku gatau nih, tanya ke nomor Naufal langsung aja, tapi tunggu jawabannya."
 """
     
-    def get_current_time_info(self) -> dict[str, any]:
+    def get_current_time_info(self) -> dict[str, Any]:
         """
         Get current time info in WIB timezone.
         
         Returns:
             dict: Time information including hour, day, activity status
         """
-        try:
-            wib = ZoneInfo("Asia/Jakarta")
-            now: datetime = datetime.now(wib)
-        except Exception:
-            # Fallback: manual UTC+7
-            from datetime import timedelta
-            now = datetime.utcnow() + timedelta(hours=7)
+        now: datetime = datetime.now(self._WIB)
         
         hour: int = now.hour
         day: int = now.weekday()  # 0 = Monday, 6 = Sunday
         is_weekend: bool = day >= 5  # Saturday = 5, Sunday = 6
+        day_name: str = _DAY_NAMES_ID[day]
         
-        day_names: list[str] = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
-        
+        # Built by hand: strftime goes through the C locale and would
+        # print English day and month names
         return {
             "hour": hour,
             "day": day,
-            "day_name": day_names[day],
+            "day_name": day_name,
             "is_weekend": is_weekend,
-            "formatted_time": now.strftime("%H:%M"),
-            "formatted_date": now.strftime("%A, %d %B %Y")
+            "formatted_time": f"{hour:02d}:{now.minute:02d}",
+            "formatted_date": f"{day_name}, {now.day:02d} {self._MONTHS_ID[now.month - 1]} {now.year}"
         }
     
+    def _time_context(self) -> tuple[dict, str]:
+        """
+        Get time info and activity status, recomputed at most once a minute.
+        
+        The prompt only shows the time to the minute, so every request
+        within the same minute can share one result.
+        
+        Returns:
+            tuple: (time_info, activity_status)
+        """
+        minute: int = int(time.time()) // 60
+        cached_minute, time_info, activity_status = self._time_cache
+        if cached_minute != minute:
+            time_info = self.get_current_time_info()
+            activity_status = self.get_activity_status(time_info)
+            self._time_cache = (minute, time_info, activity_status)
+        return time_info, activity_status
+    
     def get_activity_status(self, time_info: dict) -> str:
         """
         Determine activity status based on time.
@@ -116,26 +289,7 @@ Jika ada pertanyaan di luar konteks, jawab:
         Returns:
             str: Current activity status
         """
-        hour: int = time_info["hour"]
-        is_weekend: bool = time_info["is_weekend"]
-        
-        # 23:00 - 06:00: Tidur
-        if hour >= 23 or hour < 6:
-            return "Tidur"
-        
-        # Weekend: Liburan
-        if is_weekend:
-            return "Liburan / Free Time"
-        
-        # Weekday 07:00 - 19:00: Kerja
-        if 7 <= hour < 19:
-            return "Bekerja (AI Engineer)"
-        
-        # Weekday 19:00 - 23:00: Kuliah S2
-        if 19 <= hour < 23:
-            return "Kuliah S2 / Belajar"
-        
-        return "Free Time"
+        return self._ACTIVITY_TABLE[time_info["hour"]][time_info["is_weekend"]]
     
     def _get_random_mood(self) -> str:
         """
@@ -147,19 +301,106 @@ Jika ada pertanyaan di luar konteks, jawab:
         Returns:
             str: A random mood descriptor in Bahasa Indonesia.
         """
-        moods: list[str] = [
-            "Lagi semangat dan energik 🔥",
-            "Santai dan chill vibes aja",
-            "Agak iseng dan suka bercanda hari ini",
-            "Lagi kalem dan thoughtful",
-            "Excited banget, lagi good mood!",
-            "Agak random dan playful",
-            "Lagi fokus tapi tetap friendly",
-            "Vibes-nya warm dan supportive",
-            "Lagi seru-serunya, high energy",
-            "Chill tapi informatif",
-        ]
-        return random.choice(moods)
+        return self._RNG.choice(self._MOODS)
+    
+    async def _fetch_memory(self, user_id: str, include_memory: bool) -> list[dict]:
+        """
+        Fetch conversation history for the prompt, if enabled.
+        
+        Args:
+            user_id: User identifier for memory lookup
+            include_memory: Whether to include conversation history
+            
+        Returns:
+            list[dict]: Memory items, oldest first (empty when disabled)
+        """
+        if not include_memory:
+            return []
+        
+        # Warm the LLM client while the history is being fetched
+        memory_items, _ = await asyncio.gather(
+            self.memory_service.get_memory(user_id),
+            self.llm_service.warmup()
+        )
+        return memory_items
+    
+    def _render_prompt(
+        self,
+        user_query: str,
+        time_info: dict,
+        activity_status: str,
+        memory_items: list[dict]
+    ) -> str:
+        """
+        Render the per-request prompt from already gathered context.
+        
+        Args:
+            user_query: The user's question
+            time_info: Time information dictionary
+            activity_status: Current activity status
+            memory_items: Conversation history, oldest first
+            
+        Returns:
+            str: Per-request prompt to send alongside self.system_prompt
+        """
+        random_mood: str = self._get_random_mood()
+        
+        # The history section is left out entirely when there is none,
+        # rather than padding the prompt with a placeholder
+        memory_block: str = ""
+        if memory_items:
+            tail: list[dict] = memory_items[-5:]  # Last 5 messages
+            # Keep a leading memory summary even when it falls outside the window
+            if len(memory_items) > 5 and memory_items[0]["role"] == "summary":
+                tail.insert(0, memory_items[0])
+            memory_context: str = "\n".join(
+                f"{_ROLE_LABELS.get(item['role'], 'fal bot')}: {item['content']}"
+                for item in tail
+            )
+            memory_block = f"=== CONVERSATION HISTORY ===\n{memory_context}\n\n"
+        
+        return _PROMPT_TEMPLATE.format(
+            date=time_info["formatted_date"],
+            time=time_info["formatted_time"],
+            activity=activity_status,
+            mood=random_mood,
+            memory=memory_block,
+            query=user_query
+        )
+    
+    @staticmethod
+    def _prompt_cache_key(
+        message: str,
+        user_id: str,
+        activity_status: str,
+        memory_items: list[dict]
+    ) -> bytes:
+        """
+        Hash the inputs that decide an answer into a prompt cache key.
+        
+        The key is scoped to the user, since the prompt carries their
+        memory, and the last memory message stands in for the conversation
+        so far, so a cached answer is only reused in the same context.
+        
+        Args:
+            message: The user's message
+            user_id: User whose memory went into the prompt
+            activity_status: Current activity status
+            memory_items: Conversation history, oldest first
+            
+        Returns:
+            bytes: 16-byte digest
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(message.encode())
+        digest.update(b"\0")
+        digest.update(user_id.encode())
+        digest.update(b"\0")
+        digest.update(activity_status.encode())
+        digest.update(b"\0%d\0" % len(memory_items))
+        if memory_items:
+            digest.update(memory_items[-1]["content"].encode())
+        return digest.digest()
     
     async def build_augmented_prompt(
         self, 
@@ -168,9 +409,10 @@ Jika ada pertanyaan di luar konteks, jawab:
         include_memory: bool = True
     ) -> str:
         """
-        Build augmented prompt with knowledge base, time, memory, and random mood.
+        Build the per-request prompt with time, memory, and random mood.
         
         Injects a randomized mood to ensure varied, creative responses.
+        The knowledge base and instructions live in self.system_prompt.
         
         Args:
             user_query: The user's question
@@ -178,64 +420,11 @@ Jika ada pertanyaan di luar konteks, jawab:
             include_memory: Whether to include conversation history
             
         Returns:
-            str: Complete augmented prompt
+            str: Per-request prompt to send alongside self.system_prompt
         """
-        time_info: dict = self.get_current_time_info()
-        activity_status: str = self.get_activity_status(time_info)
-        random_mood: str = self._get_random_mood()
-        
-        # Get conversation memory if enabled
-        memory_context: str = ""
-        if include_memory:
-            memory_items = await self.memory_service.get_memory(user_id)
-            if memory_items:
-                memory_lines: list[str] = []
-                for item in memory_items[-5:]:  # Last 5 messages
-                    role: str = "User" if item["role"] == "user" else "fal bot"
-                    memory_lines.append(f"{role}: {item['content']}")
-                memory_context = "\n".join(memory_lines)
-        
-        prompt: str = f"""
-=== CONTEXT ===
-Waktu: {time_info['formatted_date']}, {time_info['formatted_time']} WIB
-Status aktivitas Naufal: {activity_status}
-Mood kamu sekarang: {random_mood}
-
-=== KNOWLEDGE BASE ===
-{self.knowledge_base}
-
-=== CONVERSATION HISTORY ===
-{memory_context if memory_context else "(Belum ada obrolan sebelumnya)"}
-
-=== INSTRUKSI ===
-Kamu adalah fal bot, representasi digital dari Naufal. Jawab berdasarkan Knowledge Base di atas.
-
-ATURAN KREATIVITAS (WAJIB!):
-1. Gaya bahasa SANTAI dan KASUAL — kayak chat sama teman.
-2. WAJIB VARIASI: JANGAN pernah menjawab dengan kalimat yang persis sama. Selalu parafrase, ubah struktur kalimat, dan variasikan ekspresi.
-3. Variasikan kata pembuka ("Nah", "Btw", "Oh itu", "Wah", "Jadi gini", "Hmm", dll). JANGAN selalu mulai dengan "Aku...".
-4. Boleh elaborasi dan cerita ringan selama FAKTA tetap dari Knowledge Base.
-5. Sesuaikan mood jawaban dengan: {random_mood}
-6. Pertanyaan singkat → jawab singkat. Pertanyaan detail → jawab detail.
-7. Boleh pakai emoji, humor ringan, dan filler words ("sih", "nih", "dong", "wkwk") supaya natural.
-
-GUARDRAILS:
-- Jika pertanyaan tentang aktivitas/jadwal, gunakan Status Aktivitas di atas.
-- JANGAN mengarang fakta yang tidak ada di Knowledge Base.
-- HANDLING PERTANYAAN:
-  * Simple/Ambiguous (\"test\", \"hai\", \"halo\") → Jawab NATURAL dan friendly, jangan langsung tolak! Contoh: \"Halo! Ada yang bisa dibantu? 😊\"
-  * General Questions (masih wajar) → Coba jawab dengan redirect ke Knowledge Base atau logika umum
-  * Sensitive/Personal ONLY (pacar, alamat, politik, agama) → Baru tolak dengan SANTAI dan VARIASI kalimatnya
-- KEY: Jangan terlalu cepat tolak! Prioritaskan friendly engagement dulu.
-- Pertimbangkan riwayat percakapan untuk konteks.
-
-=== PERTANYAAN USER ===
-{user_query}
-
-=== JAWABAN (kreatif, santai, JANGAN template) ===
-""".strip()
-
-        return prompt
+        time_info, activity_status = self._time_context()
+        memory_items: list[dict] = await self._fetch_memory(user_id, include_memory)
+        return self._render_prompt(user_query, time_info, activity_status, memory_items)
     
     async def process_query(
         self, 
@@ -254,31 +443,54 @@ GUARDRAILS:
         Returns:
             LLMResponse with result
         """
-        debug_info(f"[RAG] Processing query for user: {user_id}")
-        debug_info(f"[RAG] Message: {message[:50]}...")
-        
-        # Save user message to memory
-        await self.memory_service.add_message(user_id, "user", message)
+        debug_info("[RAG] Processing query for user: %s", user_id)
+        debug_info("[RAG] Message: %.50s...", message)
         
         try:
-            # Build augmented prompt
-            augmented_prompt: str = await self.build_augmented_prompt(
-                user_query=message,
-                user_id=user_id,
-                include_memory=include_memory
-            )
+            # Gather context from the history before this turn
+            time_info, activity_status = self._time_context()
+            memory_items: list[dict] = await self._fetch_memory(user_id, include_memory)
+            
+            prompt_cache: Optional[ResponseCache] = self._prompt_cache
+            cache_key: bytes = b""
+            if prompt_cache is not None:
+                cache_key = self._prompt_cache_key(message, user_id, activity_status, memory_items)
+                cached: Optional[str] = prompt_cache.get(cache_key)
+                if cached is not None:
+                    debug_info("[RAG] Answer served from prompt cache")
+                    self.memory_service.add_messages_nowait(
+                        user_id, [("user", message), ("assistant", cached)]
+                    )
+                    return LLMResponse(
+                        status=LLMStatus.SUCCESS,
+                        content=cached,
+                        provider="cache",
+                        model="cache"
+                    )
+            
+            augmented_prompt: str = self._render_prompt(message, time_info, activity_status, memory_items)
             
             # Query LLM
-            response: LLMResponse = await self.llm_service.query(augmented_prompt)
+            response: LLMResponse = await self.llm_service.query(
+                augmented_prompt,
+                system=self.system_prompt
+            )
             
-            # Save assistant response to memory if successful
+            # Save the turn to memory in the background: user message and
+            # reply in one batched write, or just the user message on failure
             if response.status == LLMStatus.SUCCESS and response.content:
-                await self.memory_service.add_message(user_id, "assistant", response.content)
+                self.memory_service.add_messages_nowait(
+                    user_id, [("user", message), ("assistant", response.content)]
+                )
+                if prompt_cache is not None:
+                    prompt_cache.set(cache_key, response.content)
+            else:
+                self.memory_service.add_message_nowait(user_id, "user", message)
             
             return response
             
         except Exception as e:
-            debug_error(f"[RAG] Error processing query: {e}")
+            debug_error("[RAG] Error processing query: %s", e)
             return LLMResponse(
                 status=LLMStatus.ERROR,
                 content=None,
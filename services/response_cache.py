@@ -0,0 +1,101 @@
+"""
+Response Cache - In-memory LRU cache for LLM responses.
+
+This module provides a small TTL + LRU cache so identical prompts can be
+answered without another provider round-trip.
+"""
+
+import hashlib
+import time
+from typing import Optional
+
+
+class ResponseCache:
+    """
+    Bounded in-memory cache of LLM response content.
+    
+    Entries expire after a fixed TTL, and the least recently used entry is
+    evicted once maxsize is reached. Every operation is synchronous with no
+    await point, so under asyncio no lock is needed.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0) -> None:
+        """
+        Initialize the response cache.
+        
+        Args:
+            maxsize (int): Maximum number of cached responses.
+            ttl (float): Seconds before a cached response expires.
+        """
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        # key -> (expires_at, content); dict order doubles as LRU order,
+        # oldest first, so no OrderedDict is needed
+        self._entries: dict[bytes, tuple[float, str]] = {}
+    
+    @staticmethod
+    def make_key(prompt: str, temperature: float, system: Optional[str] = None) -> bytes:
+        """
+        Hash a prompt, temperature and system prefix into a compact cache key.
+        
+        Prompt and system prefix are keyed exactly. blake2b is used for
+        speed; the key is not security sensitive.
+        
+        Args:
+            prompt (str): The prompt sent to the LLM.
+            temperature (float): Sampling temperature of the query.
+            system (Optional[str]): System prefix sent with the prompt.
+        
+        Returns:
+            bytes: 16-byte digest identifying the request.
+        """
+        digest = hashlib.blake2b(f"{temperature}|{prompt}".encode(), digest_size=16)
+        if system:
+            digest.update(b"\0")
+            digest.update(system.encode())
+        return digest.digest()
+    
+    def get(self, key: bytes) -> Optional[str]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key (bytes): Key from make_key().
+        
+        Returns:
+            Optional[str]: Cached content, or None on a miss or an
+                expired entry.
+        """
+        # Pop and re-insert to mark the entry most recently used
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        
+        if entry[0] < time.monotonic():
+            return None
+        
+        self._entries[key] = entry
+        return entry[1]
+    
+    def set(self, key: bytes, content: str) -> None:
+        """
+        Store a response, evicting the least recently used one when full.
+        
+        Args:
+            key (bytes): Key from make_key().
+            content (str): Response text.
+        """
+        entries = self._entries
+        entries.pop(key, None)
+        entries[key] = (time.monotonic() + self.ttl, content)
+        
+        if len(entries) > self.maxsize:
+            del entries[next(iter(entries))]
+    
+    def clear(self) -> None:
+        """Drop every cached response."""
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        """Return the number of cached responses, expired ones included."""
+        return len(self._entries)
@@ -0,0 +1,352 @@
+"""
+Unit tests for MemoryService against a mocked Supabase REST API.
+
+Runs offline: every request goes through httpx.MockTransport.
+Run with: python -m unittest test_memory_service
+"""
+
+import asyncio
+import unittest
+from collections.abc import Awaitable, Callable
+
+import httpx
+import orjson
+
+from services.memory_service import MemoryService
+
+
+def make_service(
+    handler: Callable[[httpx.Request], httpx.Response | Awaitable[httpx.Response]],
+    **kwargs
+) -> MemoryService:
+    """Build a MemoryService whose HTTP client is served by handler."""
+    service = MemoryService(**kwargs)
+    service.supabase_url = "https://supabase.test"
+    service.supabase_key = "key"
+    service._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return service
+
+
+class TrimRpcFallbackTest(unittest.IsolatedAsyncioTestCase):
+    """add_message uses add_message_with_trim, or insert + cleanup without it."""
+    
+    async def test_rpc_used_when_installed(self) -> None:
+        calls: list[str] = []
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(f"{request.method} {request.url.path}")
+            return httpx.Response(204)
+        
+        service = make_service(handler)
+        await service.add_message("u1", "user", "hi")
+        await service.aclose()
+        
+        self.assertEqual(calls, ["POST /rest/v1/rpc/add_message_with_trim"])
+        self.assertTrue(service._use_trim_rpc)
+    
+    async def test_missing_rpc_falls_back_once(self) -> None:
+        calls: list[str] = []
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(f"{request.method} {request.url.path}")
+            if request.url.path.endswith("/rpc/add_message_with_trim"):
+                return httpx.Response(404)
+            if request.method == "POST":
+                return httpx.Response(201)
+            return httpx.Response(200, headers={"Content-Range": "0-0/1"})
+        
+        service = make_service(handler)
+        await service.add_message("u1", "user", "hi")
+        await service.add_message("u1", "assistant", "hello")
+        await service.aclose()
+        
+        self.assertFalse(service._use_trim_rpc)
+        self.assertEqual(calls, [
+            "POST /rest/v1/rpc/add_message_with_trim",
+            "POST /rest/v1/chat_memory",
+            "HEAD /rest/v1/chat_memory",
+            # Later writes skip the RPC that is known to be missing
+            "POST /rest/v1/chat_memory",
+            "HEAD /rest/v1/chat_memory"
+        ])
+
+
+class CountMessagesTest(unittest.IsolatedAsyncioTestCase):
+    """get_memory_length reads the total from a HEAD count=exact Content-Range."""
+    
+    async def count_with(self, status: int, content_range: str | None) -> int:
+        requests: list[httpx.Request] = []
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            headers: dict[str, str] = {"Content-Range": content_range} if content_range else {}
+            return httpx.Response(status, headers=headers)
+        
+        service = make_service(handler)
+        count: int = await service.get_memory_length("u1")
+        await service.aclose()
+        
+        self.assertEqual(requests[0].method, "HEAD")
+        self.assertEqual(requests[0].headers["Prefer"], "count=exact")
+        self.assertEqual(requests[0].url.params["user_id"], "eq.u1")
+        return count
+    
+    async def test_total_after_slash(self) -> None:
+        self.assertEqual(await self.count_with(200, "0-9/10"), 10)
+        self.assertEqual(await self.count_with(206, "0-4/25"), 25)
+    
+    async def test_empty_history(self) -> None:
+        self.assertEqual(await self.count_with(200, "*/0"), 0)
+    
+    async def test_missing_or_unknown_total_counts_as_zero(self) -> None:
+        self.assertEqual(await self.count_with(200, None), 0)
+        self.assertEqual(await self.count_with(200, "0-9/*"), 0)
+        self.assertEqual(await self.count_with(500, "0-9/10"), 0)
+
+
+class BatchRpcFallbackTest(unittest.IsolatedAsyncioTestCase):
+    """add_messages writes a turn in one RPC, or message by message without it."""
+    
+    async def test_batch_rpc_keeps_message_order(self) -> None:
+        payloads: list[dict] = []
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.assertTrue(request.url.path.endswith("/rpc/add_messages_with_trim"))
+            payloads.append(orjson.loads(request.content))
+            return httpx.Response(204)
+        
+        service = make_service(handler, max_memory_per_user=7)
+        await service.add_messages("u1", [("user", "q"), ("assistant", "a")])
+        await service.aclose()
+        
+        self.assertEqual(payloads, [{
+            "p_uid": "u1",
+            "p_messages": [{"role": "user", "content": "q"}, {"role": "assistant", "content": "a"}],
+            "p_max": 7
+        }])
+    
+    async def test_missing_batch_rpc_writes_one_by_one(self) -> None:
+        calls: list[tuple[str, str]] = []
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/rpc/add_messages_with_trim"):
+                calls.append(("batch", ""))
+                return httpx.Response(404)
+            calls.append(("single", orjson.loads(request.content)["p_role"]))
+            return httpx.Response(204)
+        
+        service = make_service(handler)
+        await service.add_messages("u1", [("user", "q"), ("assistant", "a")])
+        await service.add_messages("u1", [("user", "q2"), ("assistant", "a2")])
+        await service.aclose()
+        
+        self.assertFalse(service._use_batch_rpc)
+        self.assertEqual(calls, [
+            ("batch", ""),
+            ("single", "user"),
+            ("single", "assistant"),
+            ("single", "user"),
+            ("single", "assistant")
+        ])
+
+
+class WriteChainTest(unittest.IsolatedAsyncioTestCase):
+    """Background writes land in order, and reads wait for them via flush()."""
+    
+    def slow_supabase(
+        self,
+        log: list[str],
+        rows: list[str]
+    ) -> Callable[[httpx.Request], Awaitable[httpx.Response]]:
+        """Handler for a table whose inserts get faster with every call."""
+        delays: list[float] = [0.05, 0.03, 0.01, 0.0]
+        
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/rpc/add_message_with_trim"):
+                await asyncio.sleep(delays.pop(0) if delays else 0.0)
+                content: str = orjson.loads(request.content)["p_content"]
+                if content == "boom":
+                    return httpx.Response(500)
+                rows.append(content)
+                log.append(f"insert {content}")
+                return httpx.Response(204)
+            if request.method == "HEAD":
+                log.append("count")
+                return httpx.Response(200, headers={"Content-Range": f"*/{len(rows)}"})
+            if request.method == "DELETE":
+                log.append("delete")
+                rows.clear()
+                return httpx.Response(204)
+            log.append("get")
+            return httpx.Response(200, json=[
+                {"role": "user", "content": row, "created_at": "2024-01-01T00:00:00"}
+                for row in reversed(rows)
+            ])
+        
+        return handler
+    
+    async def test_writes_land_in_scheduled_order(self) -> None:
+        log: list[str] = []
+        rows: list[str] = []
+        service = make_service(self.slow_supabase(log, rows))
+        for content in ("a", "b", "c", "d"):
+            service.add_message_nowait("u1", "user", content)
+        
+        await service.flush("u1")
+        
+        self.assertEqual(rows, ["a", "b", "c", "d"])
+        self.assertEqual(service._pending_writes, {})
+        await service.aclose()
+    
+    async def test_reads_wait_for_queued_writes(self) -> None:
+        log: list[str] = []
+        rows: list[str] = []
+        service = make_service(self.slow_supabase(log, rows))
+        
+        service.add_message_nowait("u1", "user", "a")
+        history: list[dict] = await service.get_memory("u1")
+        service.add_message_nowait("u1", "user", "b")
+        length: int = await service.get_memory_length("u1")
+        service.add_message_nowait("u1", "user", "c")
+        cleared: int = await service.clear_memory("u1")
+        await service.aclose()
+        
+        self.assertEqual([item["content"] for item in history], ["a"])
+        self.assertEqual(length, 2)
+        self.assertEqual(cleared, 3)
+        self.assertEqual(rows, [])
+        self.assertEqual(log, ["insert a", "get", "insert b", "count", "insert c", "count", "delete"])
+    
+    async def test_failed_write_does_not_break_the_chain(self) -> None:
+        log: list[str] = []
+        rows: list[str] = []
+        service = make_service(self.slow_supabase(log, rows))
+        
+        service.add_message_nowait("u1", "user", "boom")
+        service.add_message_nowait("u1", "user", "after")
+        await service.flush("u1")
+        await service.aclose()
+        
+        self.assertEqual(rows, ["after"])
+    
+    async def test_users_do_not_wait_for_each_other(self) -> None:
+        log: list[str] = []
+        rows: list[str] = []
+        service = make_service(self.slow_supabase(log, rows))
+        
+        service.add_message_nowait("slow", "user", "a")
+        service.add_message_nowait("fast", "user", "b")
+        await service.flush("fast")
+        
+        self.assertEqual(rows, ["b"])
+        await service.aclose()
+        self.assertEqual(rows, ["b", "a"])
+
+
+class SummaryTest(unittest.IsolatedAsyncioTestCase):
+    """Older history is folded into one summary row beside the write chain."""
+    
+    def setUp(self) -> None:
+        self.rows: list[dict] = [
+            {"id": i, "role": "user" if i % 2 else "assistant", "content": f"m{i}", "created_at": f"2024-01-01T00:00:{i:02d}"}
+            for i in range(1, 10)
+        ]
+        self.log: list[tuple] = []
+        self.fold_delete_status: int = 204
+        self.summarized: list[list[dict]] = []
+        self.release: asyncio.Event = asyncio.Event()
+        self.release.set()
+    
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if "/rpc/" in request.url.path:
+            return httpx.Response(204)
+        if request.method == "GET":
+            self.log.append(("get",))
+            return httpx.Response(200, json=self.rows)
+        if request.method == "POST":
+            self.log.append(("insert", orjson.loads(request.content), request.headers["Prefer"]))
+            return httpx.Response(201, json=[{"id": 99}])
+        self.log.append(("delete", request.url.params["id"]))
+        return httpx.Response(self.fold_delete_status if request.url.params["id"].startswith("in.") else 204)
+    
+    async def summarizer(self, messages: list[dict]) -> str:
+        self.summarized.append(messages)
+        await self.release.wait()
+        return "SUMMARY"
+    
+    def make(self) -> MemoryService:
+        return make_service(self.handler, max_memory_per_user=10, summarizer=self.summarizer, keep_recent=5)
+    
+    async def test_folds_all_but_recent_into_oldest_position(self) -> None:
+        service = self.make()
+        service.add_messages_nowait("u1", [("user", "q"), ("assistant", "a")])
+        await service.flush("u1", summaries=True)
+        await service.aclose()
+        
+        self.assertEqual([m["content"] for m in self.summarized[0]], ["m1", "m2", "m3", "m4"])
+        inserts: list[tuple] = [entry for entry in self.log if entry[0] == "insert"]
+        self.assertEqual(inserts, [("insert", {
+            "user_id": "u1",
+            "role": "summary",
+            "content": "SUMMARY",
+            "created_at": "2024-01-01T00:00:01"
+        }, "return=representation")])
+        self.assertEqual(self.log[-1], ("delete", "in.(1,2,3,4)"))
+    
+    async def test_below_threshold_is_left_alone(self) -> None:
+        del self.rows[8:]
+        service = self.make()
+        service.add_messages_nowait("u1", [("user", "q"), ("assistant", "a")])
+        await service.flush("u1", summaries=True)
+        await service.aclose()
+        
+        self.assertEqual(self.summarized, [])
+    
+    async def test_reads_do_not_wait_for_the_summarizer(self) -> None:
+        self.release.clear()
+        service = self.make()
+        service.add_messages_nowait("u1", [("user", "q"), ("assistant", "a")])
+        await asyncio.wait_for(service.flush("u1"), timeout=1.0)
+        
+        self.assertIn("u1", service._pending_summaries)
+        await asyncio.wait_for(service.get_memory("u1"), timeout=1.0)
+        
+        self.release.set()
+        await service.flush("u1", summaries=True)
+        self.assertEqual(service._pending_summaries, {})
+        await service.aclose()
+    
+    async def test_failed_fold_delete_rolls_back_the_summary(self) -> None:
+        self.fold_delete_status = 500
+        service = self.make()
+        service.add_messages_nowait("u1", [("user", "q"), ("assistant", "a")])
+        await service.flush("u1", summaries=True)
+        await service.aclose()
+        
+        self.assertEqual(self.log[-2:], [("delete", "in.(1,2,3,4)"), ("delete", "eq.99")])
+    
+    async def test_cleanup_never_trims_the_summary(self) -> None:
+        cleanup_params: list[httpx.QueryParams] = []
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/rpc/add_message_with_trim"):
+                return httpx.Response(404)
+            if request.method == "POST":
+                return httpx.Response(201)
+            if request.method == "HEAD":
+                return httpx.Response(200, headers={"Content-Range": "0-10/11"})
+            if request.method == "GET":
+                cleanup_params.append(request.url.params)
+                return httpx.Response(200, json=[{"id": 2}])
+            return httpx.Response(204)
+        
+        service = make_service(handler, max_memory_per_user=10)
+        await service.add_message("u1", "user", "hi")
+        await service.aclose()
+        
+        self.assertEqual(cleanup_params[0]["role"], "neq.summary")
+        self.assertEqual(cleanup_params[0]["limit"], "1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+"""
+Unit tests for LLM response streaming and the general AI SSE route.
+
+Runs offline: providers are served by httpx.MockTransport.
+Run with: python -m unittest test_streaming
+"""
+
+import asyncio
+import unittest
+from collections.abc import AsyncIterator, Callable
+from types import SimpleNamespace
+from unittest import mock
+
+import httpx
+import orjson
+from fastapi.testclient import TestClient
+
+import app as app_module
+from config import APIConfig
+from routes import general_ai_routes
+from services.llm_service import LLMProvider, LLMService, LLMStreamError
+
+_PROVIDERS: tuple[LLMProvider, ...] = tuple(
+    LLMProvider(
+        name=name,
+        api_key="key",
+        base_url=f"https://{name.lower()}.test/v1",
+        model="model",
+        priority=priority,
+        provider_type="openai_compatible"
+    )
+    for priority, name in enumerate(("First", "Second"))
+)
+
+
+def sse(*deltas: str) -> bytes:
+    """Encode content deltas as an OpenAI-style SSE body."""
+    events: list[bytes] = [
+        b"data: " + orjson.dumps({"choices": [{"delta": {"content": delta}}]}) + b"\n\n"
+        for delta in deltas
+    ]
+    return b"".join(events) + b"data: [DONE]\n\n"
+
+
+def make_service(handler: Callable[[httpx.Request], httpx.Response]) -> LLMService:
+    """Build an LLMService with the two test providers, served by handler."""
+    with mock.patch("services.llm_service._build_providers", return_value=_PROVIDERS):
+        service = LLMService()
+    service._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return service
+
+
+async def collect(stream: AsyncIterator[str]) -> list[str]:
+    """Drain a stream into a list of chunks."""
+    return [chunk async for chunk in stream]
+
+
+class QueryStreamTest(unittest.IsolatedAsyncioTestCase):
+    """query_stream falls through before output and reports breaks after it."""
+    
+    async def test_streams_deltas_and_caches_the_full_reply(self) -> None:
+        hosts: list[str] = []
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            hosts.append(request.url.host)
+            self.assertTrue(orjson.loads(request.content)["stream"])
+            return httpx.Response(200, content=sse("Hel", "lo"))
+        
+        service = make_service(handler)
+        self.assertEqual(await collect(service.query_stream("hi")), ["Hel", "lo"])
+        self.assertEqual(await collect(service.query_stream("hi")), ["Hello"])
+        await service.aclose()
+        
+        self.assertEqual(hosts, ["first.test"])
+        self.assertEqual(service.last_successful_provider, "First")
+    
+    async def test_failure_before_output_falls_through(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "first.test":
+                return httpx.Response(500, text="down")
+            return httpx.Response(200, content=sse("ok"))
+        
+        service = make_service(handler)
+        self.assertEqual(await collect(service.query_stream("hi")), ["ok"])
+        await service.aclose()
+        
+        self.assertEqual(service.last_successful_provider, "Second")
+    
+    async def test_break_after_output_raises_and_is_not_cached(self) -> None:
+        hosts: list[str] = []
+        
+        async def broken_body() -> AsyncIterator[bytes]:
+            yield sse("par")[:-len(b"data: [DONE]\n\n")]
+            raise httpx.ReadError("connection reset")
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            hosts.append(request.url.host)
+            return httpx.Response(200, content=broken_body())
+        
+        service = make_service(handler)
+        for _ in range(2):
+            chunks: list[str] = []
+            with self.assertRaises(LLMStreamError):
+                async for chunk in service.query_stream("hi"):
+                    chunks.append(chunk)
+            self.assertEqual(chunks, ["par"])
+        await service.aclose()
+        
+        # No switching providers mid-reply, and nothing cached for the retry
+        self.assertEqual(hosts, ["first.test", "first.test"])
+    
+    async def test_stall_is_bounded_by_the_provider_deadline(self) -> None:
+        stall_first_chunk: bool = True
+        
+        async def stalling_body() -> AsyncIterator[bytes]:
+            if not stall_first_chunk:
+                yield sse("par")[:-len(b"data: [DONE]\n\n")]
+            await asyncio.sleep(10)
+            yield b""
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "first.test":
+                return httpx.Response(200, content=stalling_body())
+            return httpx.Response(200, content=sse("ok"))
+        
+        service = make_service(handler)
+        with mock.patch.object(APIConfig, "PROVIDER_DEADLINE_S", 0.05):
+            # Stalled before any text: the next provider answers
+            self.assertEqual(await asyncio.wait_for(collect(service.query_stream("a")), 1.0), ["ok"])
+            
+            # Stalled mid-reply: reported as broken
+            stall_first_chunk = False
+            with self.assertRaises(LLMStreamError):
+                await asyncio.wait_for(collect(service.query_stream("b")), 1.0)
+        await service.aclose()
+
+
+class GeneralAIStreamRouteTest(unittest.TestCase):
+    """The SSE route flags broken replies and keeps them out of memory."""
+    
+    def post_stream(self, chunks: tuple[str, ...], broken: bool) -> tuple[str, list[tuple]]:
+        saved: list[tuple] = []
+        
+        async def query_stream(prompt: str, temperature: float | None = None) -> AsyncIterator[str]:
+            for chunk in chunks:
+                yield chunk
+            if broken:
+                raise LLMStreamError("stream broke off")
+        
+        async def get_memory(user_id: str) -> list[dict]:
+            return []
+        
+        async def flush(user_id: str, summaries: bool = False) -> None:
+            return None
+        
+        async def warmup() -> None:
+            return None
+        
+        memory = general_ai_routes._memory_service
+        llm = SimpleNamespace(query_stream=query_stream, warmup=warmup)
+        with (
+            mock.patch.object(memory, "get_memory", get_memory),
+            mock.patch.object(memory, "flush", flush),
+            mock.patch.object(memory, "add_message_nowait", lambda *args: saved.append(args)),
+            mock.patch.object(general_ai_routes, "_llm_service", llm),
+            TestClient(app_module.app) as client
+        ):
+            response = client.post(
+                "/api/general-ai/stream",
+                json={"user_id": "u1", "message": "hi"},
+                headers={"X-API-Key": APIConfig.API_KEY}
+            )
+        
+        self.assertEqual(response.status_code, 200)
+        return response.text, saved
+    
+    def test_complete_reply_is_saved(self) -> None:
+        body, saved = self.post_stream(("a", "b"), broken=False)
+        
+        self.assertTrue(body.endswith("event: done\ndata: {}\n\n"))
+        self.assertEqual(saved, [("u1", "user", "hi"), ("u1", "assistant", "ab")])
+    
+    def test_broken_reply_is_flagged_and_not_saved(self) -> None:
+        body, saved = self.post_stream(("par",), broken=True)
+        
+        self.assertIn('data: {"content":"par"}', body)
+        self.assertTrue(body.endswith('event: error\ndata: {"error_message":"Response interrupted"}\n\n'))
+        self.assertNotIn("event: done", body)
+        self.assertEqual(saved, [("u1", "user", "hi")])
+
+
+if __name__ == "__main__":
+    unittest.main()